@@ -0,0 +1,214 @@
+"""
+PROJECT 1 - Doubly Linked List - Thread Safe Variant
+Cyclic doubly linked list shared between producer and consumer threads
+"""
+
+from __future__ import annotations  # allow self-reference
+from threading import Condition, Lock
+from time import monotonic
+from typing import TypeVar, Generic, Iterable
+
+from Project1.List import List
+from Project1.Node import DoublyLinkedListNode as Node
+
+T = TypeVar("T")
+
+SMALL = 3  # below this many nodes the two ends share nodes, so both locks are taken
+
+
+class ConcurrentList:
+    """
+    Two-lock list: operations at the front take the head lock and operations
+    at the back take the tail lock, so producers and consumers at opposite
+    ends do not contend. When the list is too short for the ends to be
+    disjoint an operation takes both locks, always head before tail.
+
+    The size is reserved before a pop unlinks its node and published after a
+    push links its node, so every thread reads a lower bound of the true size.
+    """
+
+    def __init__(self, container: Iterable[T] = None) -> None:
+        """
+        Creates root node and sets its prev and next member variable to itself
+        :param container: values to push to the back
+        """
+        self.node = Node(None)
+        self.node.prev = self.node.next = self.node
+        self._head_lock = Lock()
+        self._tail_lock = Lock()
+        self._size = 0
+        self._not_empty = Condition(Lock())  # guards _size
+
+        for item in container or ():
+            self.push_back(item)
+
+    def __repr__(self) -> str:
+        """
+        :return: Represents the list as a string utilizing __str__
+        """
+        return self.__str__()
+
+    def __str__(self) -> str:
+        """
+        :return: string representation of a consistent snapshot of the list
+        """
+        return str(self.snapshot())
+
+    def size(self) -> int:
+        """
+        :return: number of nodes not including the root node
+        """
+        with self._not_empty:
+            return self._size
+
+    def empty(self) -> bool:
+        """
+        :return: True if the list has no nodes other than the root node else False
+        """
+        return self.size() == 0
+
+    def snapshot(self) -> List:
+        """
+        :return: List copy of the values, taken while both ends are locked
+        """
+        with self._head_lock, self._tail_lock:
+            lst = List()
+            node = self.node.next
+            while node is not self.node:
+                lst.push_back(node.val)
+                node = node.next
+            return lst
+
+    def clear(self) -> None:
+        """
+        Resets list by reassigning root nodes' references to itself
+        """
+        with self._head_lock, self._tail_lock, self._not_empty:
+            self.node.prev = self.node.next = self.node
+            self._size = 0
+
+    def push_front(self, val: Generic[T]) -> None:
+        """
+        Inserts new Node with value of val in the front of the list
+        :param val: value of new Node
+        """
+        self._push(val, front=True)
+
+    def push_back(self, val: Generic[T]) -> None:
+        """
+        Inserts new Node with value of val in the back of the list
+        :param val: value of new Node
+        """
+        self._push(val, front=False)
+
+    def pop_front(self, block: bool = False, timeout: float = None) -> Generic[T]:
+        """
+        Erases Node in the front of the list
+        :param block: wait for a value when the list is empty
+        :param timeout: seconds to wait at most when block, forever when not given
+        :raises IndexError: if the list is empty, or stays empty until the timeout when block
+        :return: value of the erased Node
+        """
+        return self._pop_waiting(True, block, timeout)
+
+    def pop_back(self, block: bool = False, timeout: float = None) -> Generic[T]:
+        """
+        Erases Node in the back of the list
+        :param block: wait for a value when the list is empty
+        :param timeout: seconds to wait at most when block, forever when not given
+        :raises IndexError: if the list is empty, or stays empty until the timeout when block
+        :return: value of the erased Node
+        """
+        return self._pop_waiting(False, block, timeout)
+
+    def _lock_end(self, front: bool, pop: bool) -> tuple:
+        """
+        Locks the end the operation works on, and the other end as well when the list is short
+        Pops reserve their node by decrementing the size in the same critical section
+        :param front: operation works on the front
+        :param pop: operation removes a node
+        :return: acquired locks, in acquisition order, and whether a pop found a node
+        """
+        own = self._head_lock if front else self._tail_lock
+        own.acquire()
+        with self._not_empty:
+            if self._size >= SMALL:
+                if pop:
+                    self._size -= 1
+                return (own,), True
+
+        if front:
+            self._tail_lock.acquire()
+            locks = (self._head_lock, self._tail_lock)
+        else:
+            own.release()
+            self._head_lock.acquire()
+            self._tail_lock.acquire()
+            locks = (self._head_lock, self._tail_lock)
+        with self._not_empty:
+            if pop:
+                if self._size == 0:
+                    return locks, False
+                self._size -= 1
+        return locks, True
+
+    def _push(self, val: Generic[T], front: bool) -> None:
+        """
+        :param val: value of new Node
+        :param front: link at the front instead of the back
+        """
+        locks, _ = self._lock_end(front, pop=False)
+        try:
+            if front:
+                new = Node(val, self.node.next, self.node)
+                self.node.next.prev = new
+                self.node.next = new
+            else:
+                new = Node(val, self.node, self.node.prev)
+                self.node.prev.next = new
+                self.node.prev = new
+        finally:
+            for lock in reversed(locks):
+                lock.release()
+        with self._not_empty:
+            self._size += 1
+            self._not_empty.notify()
+
+    def _pop(self, front: bool) -> Generic[T]:
+        """
+        :param front: unlink the front instead of the back
+        :raises IndexError: if the list is empty
+        :return: value of the unlinked Node
+        """
+        locks, found = self._lock_end(front, pop=True)
+        try:
+            if not found:
+                raise IndexError("pop from an empty ConcurrentList")
+            node = self.node.next if front else self.node.prev
+            node.prev.next = node.next
+            node.next.prev = node.prev
+            return node.val
+        finally:
+            for lock in reversed(locks):
+                lock.release()
+
+    def _pop_waiting(self, front: bool, block: bool, timeout: float) -> Generic[T]:
+        """
+        :param front: unlink the front instead of the back
+        :param block: wait for a value when the list is empty
+        :param timeout: seconds to wait at most when block, forever when None
+        :raises IndexError: if no value could be popped
+        :return: value of the unlinked Node
+        """
+        deadline = None if timeout is None else monotonic() + timeout
+        while True:
+            try:
+                return self._pop(front)
+            except IndexError:
+                if not block:
+                    raise
+            with self._not_empty:
+                remaining = None if deadline is None else deadline - monotonic()
+                if remaining is not None and remaining <= 0 or \
+                        not self._not_empty.wait_for(lambda: self._size > 0, remaining):
+                    raise IndexError("pop from an empty ConcurrentList timed out")
@@ -4,11 +4,26 @@ Name: Shubham Chandna
 """
 
 from __future__ import annotations  # allow self-reference
-from typing import TypeVar, Generic, Callable  # function type
+from bisect import bisect_right
+from operator import attrgetter
+from weakref import finalize
+from typing import TypeVar, Generic, Callable, Iterable, Iterator, NamedTuple, Optional  # function type
 from Project1.Node import DoublyLinkedListNode as Node
+from Project1.SkipIndex import SkipIndex
+
+try:
+    import numpy as np
+except ImportError:  # batched remove_if falls back to the scalar predicate
+    np = None
 
 T = TypeVar("T")
 
+BATCH_SIZE = 65536  # values gathered per vectorized predicate call
+
+FINGERPRINT_MOD = (1 << 61) - 1  # Mersenne prime modulus of the rolling fingerprint
+FINGERPRINT_BASE = 0x9E3779B97F4A7C15 % FINGERPRINT_MOD
+FINGERPRINT_INVERSE = pow(FINGERPRINT_BASE, FINGERPRINT_MOD - 2, FINGERPRINT_MOD)
+
 
 class List:
     """
@@ -16,6 +31,8 @@ class List:
     structure is a cyclic Doubly Linked List
     """
 
+    debug = False  # when True, size() verifies the cached length with a full walk
+
     def __init__(self, num: int = None, val: Generic[T] = None, container: list = None) -> None:
         """
         Creates root node and sets its prev and next member variable to itself
@@ -26,6 +43,15 @@ class List:
         """
         self.node = Node(None)
         self.node.prev = self.node.next = self.node
+        self._size = 0
+        self._version = 0  # bumped by every structural change, checked by iterators
+        self._index = None  # value -> {id(node): node} when built
+        self._skip = None  # SkipIndex over the nodes when built
+        self._history = _History()  # old links of edited nodes, kept while snapshots are alive
+        self._fingerprint = 0  # polynomial hash of the values, current while _fingerprint_version == _version
+        self._fingerprint_power = 1  # FINGERPRINT_BASE ** size
+        self._fingerprint_version = -1
+        self._frozen = False
 
         if num or container:
             self.assign(num, val, container)
@@ -38,19 +64,103 @@ class List:
 
     def __eq__(self, other: List) -> bool:
         """
+        Rejects in O(1) on differing sizes, or differing fingerprints when both are frozen,
+        otherwise compares node by node
+        Values written through a node do not update the fingerprint, so it is trusted only when frozen
         :param other: compares equality with this List
         :return: True if equal otherwise False
         """
+        if isinstance(other, List):
+            if self._size != other._size:
+                return False
+            if self._frozen and other._frozen and self.fingerprint() != other.fingerprint():
+                return False
 
-        def is_equal(node1: Node, node2: Node) -> bool:
-            if node1 is self.node and node2 is other.node:
-                return True
-            if node1 is self.node or node2 is other.node or node1 != node2 \
-                    or node1.prev != node2.prev:
+        node1, node2 = self.node.next, other.node.next
+        while node1 is not self.node and node2 is not other.node:
+            if node1 != node2 or node1.prev != node2.prev:
                 return False
-            return is_equal(node1.next, node2.next)
+            node1, node2 = node1.next, node2.next
+        return node1 is self.node and node2 is other.node
+
+    def __hash__(self) -> int:
+        """
+        :raises TypeError: if the list is not frozen or holds unhashable values
+        :return: fingerprint of a frozen list
+        """
+        if not self._frozen:
+            raise TypeError("unhashable type: 'List' (freeze it first)")
+        return self.fingerprint()
+
+    def fingerprint(self) -> int:
+        """
+        Order-sensitive polynomial hash of the values modulo FINGERPRINT_MOD
+        Computed in O(n) after arbitrary changes, then kept current in O(1) by pushes and pops at
+        either end. Values must be hashable and must not be mutated in place.
+        Equal lists have equal fingerprints; equal fingerprints suggest, but do not prove, equality
+        :raises TypeError: if a value is unhashable
+        :return: fingerprint of the values
+        """
+        if self._fingerprint_version != self._version:
+            fingerprint = 0
+            for val in self:
+                fingerprint = (fingerprint * FINGERPRINT_BASE + hash(val)) % FINGERPRINT_MOD
+            self._fingerprint = fingerprint
+            self._fingerprint_power = pow(FINGERPRINT_BASE, self._size, FINGERPRINT_MOD)
+            self._fingerprint_version = self._version
+        return self._fingerprint
+
+    def freeze(self) -> None:
+        """
+        Makes the list immutable and hashable; every later mutator raises TypeError
+        :raises TypeError: if a value is unhashable
+        """
+        self.fingerprint()
+        self._frozen = True
 
-        return is_equal(self.node.next, other.node.next)
+    def frozen(self) -> bool:
+        """
+        :return: True if freeze was called else False
+        """
+        return self._frozen
+
+    def _check_mutable(self) -> None:
+        """
+        :raises TypeError: if the list is frozen
+        """
+        if self._frozen:
+            raise TypeError("frozen List does not support mutation")
+
+    def _roll_fingerprint(self, val: Generic[T], back: bool, added: bool) -> None:
+        """
+        Updates a current fingerprint for a value linked or unlinked at an end of the list
+        Called after the change, with _version already bumped once
+        :param val: value added or removed
+        :param back: the value is at the back rather than the front
+        :param added: the value was linked rather than unlinked
+        """
+        if self._fingerprint_version != self._version - 1:
+            return
+        try:
+            value_hash = hash(val)
+        except TypeError:
+            return
+        fingerprint, power = self._fingerprint, self._fingerprint_power
+        if added:
+            if back:
+                fingerprint = fingerprint * FINGERPRINT_BASE + value_hash
+            else:
+                fingerprint += value_hash * power
+            power = power * FINGERPRINT_BASE
+        else:
+            power = power * FINGERPRINT_INVERSE % FINGERPRINT_MOD
+            if back:
+                fingerprint = (fingerprint - value_hash) * FINGERPRINT_INVERSE
+            else:
+                fingerprint -= value_hash * power
+        self._fingerprint = fingerprint % FINGERPRINT_MOD
+        self._fingerprint_power = power % FINGERPRINT_MOD
+        self._fingerprint_version = self._version
 
     def assign(self, num: int = None, val: Generic[T] = None, container: list = None):
         """
@@ -62,22 +172,82 @@ class List:
         self.clear()
         node = self.node
 
+        count = 0
+
         if container:
             for item in container:
                 node.next = Node(item, prev=node)
                 node = node.next
+                count += 1
         elif num:
             for _ in range(num):
                 node.next = Node(val, prev=node)
                 node = node.next
+            count = num
 
         node.next, self.node.prev = self.node, node
+        self._size = count
+        self._version += 1
+        self._reindex_positions()
+        if self._index is not None:
+            self.build_index()
+
+    @classmethod
+    def from_iterable(cls, iterable: Iterable[T]) -> List:
+        """
+        Builds a list node by node while consuming iterable, without materializing it
+        :param iterable: values in list order, e.g. a generator
+        :return: new List holding the values
+        """
+        lst = cls()
+        lst.assign(container=iter(iterable))
+        return lst
+
+    @classmethod
+    def from_file(cls, path: str, parse: Callable[[str], T] = None, encoding: str = "utf-8") -> List:
+        """
+        Streams a file into a list with one node per line, in bounded memory
+        :param path: file to read
+        :param parse: converts a line, without its line ending, to a value; values stay strings when not given
+        :param encoding: text encoding of the file
+        :return: new List holding one value per line
+        """
+        with open(path, encoding=encoding) as file:
+            lines = (line.rstrip("\r\n") for line in file)
+            return cls.from_iterable(lines if parse is None else map(parse, lines))
+
+    def to_file(self, path: str, serialize: Callable[[T], str] = str, chunk_size: int = 4096,
+                encoding: str = "utf-8") -> None:
+        """
+        Streams the values out one per line, writing chunk_size lines at a time
+        :param path: file to write, replaced if it exists
+        :param serialize: converts a value to a line without its line ending
+        :param chunk_size: number of lines buffered between writes
+        :param encoding: text encoding of the file
+        """
+        with open(path, "w", encoding=encoding) as file:
+            chunk = []
+            node = self.node.next
+            while node is not self.node:
+                chunk.append(serialize(node.val) + "\n")
+                if len(chunk) >= chunk_size:
+                    file.writelines(chunk)
+                    chunk.clear()
+                node = node.next
+            file.writelines(chunk)
 
     def clear(self) -> None:
         """
         Resets list by reassigning root nodes' references to itself
         """
+        self._check_mutable()
+        self._record(self.node)
         self.node.prev = self.node.next = self.node
+        self._size = 0
+        self._version += 1
+        self._reindex_positions()
+        if self._index is not None:
+            self._index = {}
 
     # Implement below - Do not modify function signatures
     def empty(self) -> bool:
@@ -108,42 +278,271 @@ class List:
         """
         :param other: List to swap contents
         """
+        self._check_mutable()
+        other._check_mutable()
         temp = self.node
         self.node = other.node
         other.node = temp
+        self._size, other._size = other._size, self._size
+        self._version += 1
+        other._version += 1
+        self._index, other._index = other._index, self._index
+        self._skip, other._skip = other._skip, self._skip
+        self._history, other._history = other._history, self._history
 
     def __str__(self) -> str:
         """
-        RECURSIVE
         :return: string representation of linked list
         """
-        def to_string(node):
-            """string helper"""
-            if node is self.node:
-                return ""
-            elif node.next is self.node:
-                return "{}".format(node.val)
-            return "{}".format(node.val) + " <-> " + to_string(node.next)
+        parts = []
+        node = self.node.next
+        while node is not self.node:
+            parts.append("{}".format(node.val))
+            node = node.next
+        return " <-> ".join(parts)
+
+    def __iter__(self) -> Iterator[T]:
+        """
+        :return: generator over the values from front to back, without copying
+        """
+        return (node.val for node in self.nodes())
+
+    def __reversed__(self) -> Iterator[T]:
+        """
+        :return: generator over the values from back to front, without copying
+        """
+        return (node.val for node in self.nodes(reverse=True))
 
-        return to_string(self.node.next)
+    def nodes(self, first: Node = None, last: Node = None, reverse: bool = False) -> Iterator[Node]:
+        """
+        Lazy view of the nodes in [first, last), walking prev links instead when reverse
+        Raises RuntimeError if the list is structurally modified while the view is consumed,
+        or if the walk runs off a broken cycle instead of reaching last
+        :param first: node to start at (inclusive), the front (or back when reverse) when not given
+        :param last: node to stop at (exclusive), the root node when not given
+        :param reverse: walk from back to front
+        :return: generator over the nodes
+        """
+        root = self.node
+        if first is None:
+            first = root.prev if reverse else root.next
+        if last is None:
+            last = root
+        version = self._version
+        remaining = self._size
+
+        node = first
+        while node is not last:
+            if node is None or node is root or remaining == 0:
+                raise RuntimeError("List cycle is broken or last does not follow first")
+            yield node
+            if self._version != version:
+                raise RuntimeError("List changed during iteration")
+            remaining -= 1
+            node = node.prev if reverse else node.next
 
     def size(self) -> int:
         """
-        RECURSIVE
+        Constant time; the length is maintained by every mutator
         :return: size of list or number of nodes not including the root node
         """
+        if self.debug:
+            self.check_size()
+        return self._size
+
+    def check_size(self) -> None:
+        """
+        Debug consistency check of the cached length against a full walk of the list
+        :raises RuntimeError: if the cached length does not match the number of nodes
+        """
+        count = 0
+        node = self.node.next
+        while node is not self.node:
+            count += 1
+            node = node.next
+        if count != self._size:
+            raise RuntimeError("cached size {} does not match {} nodes".format(self._size, count))
+
+    def _link(self, position: Node, val: Generic[T]) -> Node:
+        """
+        Creates a node holding val and links it before position
+        :param position: node to insert before
+        :param val: value of new node
+        :return: the new node
+        """
+        self._check_mutable()
+        if self._skip is not None:
+            index = self._size if position is self.node else self._skip.index_of(position)
+        self._record(position, position.prev)
+        newNode = Node(val, position, position.prev)
+        position.prev.next = newNode
+        position.prev = newNode
+        self._size += 1
+        self._version += 1
+        if position is self.node or newNode.prev is self.node:
+            self._roll_fingerprint(val, position is self.node, added=True)
+        if self._index is not None:
+            self._index_add(newNode)
+        if self._skip is not None:
+            self._skip.insert(index, newNode)
+        return newNode
+
+    def _unlink(self, node: Node) -> Node:
+        """
+        Unlinks node from its neighbours
+        :param node: node to remove, never the root node
+        :return: node that followed the removed node
+        """
+        self._check_mutable()
+        self._record(node.prev, node.next)
+        node.next.prev = node.prev
+        node.prev.next = node.next
+        self._size -= 1
+        self._version += 1
+        if node.next is self.node or node.prev is self.node:
+            self._roll_fingerprint(node.val, node.next is self.node, added=False)
+        if self._index is not None:
+            self._index_discard(node)
+        if self._skip is not None:
+            self._skip.remove(node)
+        return node.next
+
+    def build_index(self) -> None:
+        """
+        Builds a hash index from each value to the nodes holding it, kept current by every mutator
+        Speeds up contains and remove; values must be hashable while the index exists
+        """
+        self._index = {}
+        node = self.node.next
+        while node is not self.node:
+            self._index_add(node)
+            node = node.next
+
+    def drop_index(self) -> None:
+        """
+        Discards the hash index
+        """
+        self._index = None
 
-        def size_list(node) -> int:
+    def _index_add(self, node: Node) -> None:
+        """
+        :param node: node to record under its value
+        """
+        bucket = self._index.get(node.val)
+        if bucket is None:
+            self._index[node.val] = {id(node): node}
+        else:
+            bucket[id(node)] = node
+
+    def _index_discard(self, node: Node) -> None:
+        """
+        :param node: node to forget
+        """
+        bucket = self._index[node.val]
+        del bucket[id(node)]
+        if not bucket:
+            del self._index[node.val]
+
+    def snapshot(self) -> ListSnapshot:
+        """
+        O(1) immutable view of the current contents
+        Afterwards the first edit of each node records its old links, so memory grows
+        with the number of edits rather than the length of the list
+        Only edits made through List methods are recorded
+        :return: read only view that keeps showing the contents at this moment
+        """
+        return self._history.snapshot(self.node, self._size)
+
+    def _record(self, *nodes: Node) -> None:
+        """
+        Saves the current links of nodes for live snapshots before they are edited
+        :param nodes: nodes about to have their next or prev changed
+        """
+        if self._history.live:
+            self._history.record(nodes)
+
+    def _record_all(self) -> None:
+        """
+        Saves the current links of every node and the root for live snapshots
+        """
+        if self._history.live:
+            self._history.record(self.nodes())
+            self._history.record((self.node,))
+
+    def build_skip_index(self) -> None:
+        """
+        Builds a skip list over the nodes for O(log n) positional access
+        Kept current incrementally by insertions and erasures, rebuilt by whole list operations
+        """
+        self._skip = SkipIndex(self.nodes())
+
+    def drop_skip_index(self) -> None:
+        """
+        Discards the skip list
+        """
+        self._skip = None
+
+    def _reindex_positions(self) -> None:
+        """
+        Rebuilds the skip list, if any, after an operation that moves many nodes
+        """
+        if self._skip is not None:
+            self._skip = SkipIndex(self.nodes())
+
+    def at(self, index: int) -> Node:
+        """
+        O(log n) with the skip index, otherwise a walk from the nearer end
+        :param index: 0 based position of node
+        :return: node at index
+        """
+        if not 0 <= index < self._size:
+            raise IndexError("List index out of range")
+        if self._skip is not None:
+            return self._skip.at(index)
+        if index < self._size // 2:
+            node = self.node.next
+            for _ in range(index):
+                node = node.next
+        else:
+            node = self.node.prev
+            for _ in range(self._size - 1 - index):
+                node = node.prev
+        return node
+
+    def index_of(self, node: Node) -> int:
+        """
+        O(log n) with the skip index, otherwise a walk from the front
+        :param node: node of this list
+        :return: 0 based position of node
+        """
+        if self._skip is not None:
+            if id(node) not in self._skip.towers:
+                raise ValueError("node is not in List")
+            return self._skip.index_of(node)
+        for index, other in enumerate(self.nodes()):
+            if other is node:
+                return index
+        raise ValueError("node is not in List")
 
-            if node.next is self.node:
-                return 0
-            return 1 + size_list(node.next)
+    def insert_at(self, index: int, val: Generic[T]) -> Node:
+        """
+        :param index: 0 based position the new node will have, 0 <= index <= size
+        :param val: value to insert
+        :return: the new node
+        """
+        if index == self._size:
+            return self.insert(self.node, val)
+        return self.insert(self.at(index), val)
 
-        return size_list(self.node)
+    def erase_at(self, index: int) -> Node:
+        """
+        :param index: 0 based position of node to erase
+        :return: node that followed the erased node
+        """
+        return self.erase(self.at(index))
 
     def insert(self, position: Node, val: Generic[T], num: int = 1) -> Node:
         """
-        RECURSIVE
         Places node before given position with a value of val
         When num is given, insert num occurrences of node
         :param position: Node index to insert new node before
@@ -152,14 +551,9 @@ class List:
         :return: node that points to the first of the newly inserted nodes
         """
 
-        if num == 0:
-            return position
-        newNode = Node(val)
-        newNode.prev = position.prev
-        position.prev.next = newNode
-        position.prev = newNode
-        newNode.next = position
-        return self.insert(newNode, val, num - 1)
+        for _ in range(num):
+            position = self._link(position, val)
+        return position
 
     def erase(self, first: Node, last: Node = None) -> Node:
         """
@@ -174,11 +568,21 @@ class List:
             return first
 
         elif last is None:
-            first.next.prev = first.prev
-            first.prev.next = first.next
-            return first.next
+            return self._unlink(first)
+
+        self._check_mutable()
+        node = first
+        while node is not last:
+            if self._index is not None:
+                self._index_discard(node)
+            if self._skip is not None:
+                self._skip.remove(node)
+            node = node.next
+            self._size -= 1
+        self._record(first.prev, last)
         first.prev.next = last
         last.prev = first.prev
+        self._version += 1
         return last
 
     def push_front(self, val: Generic[T]) -> None:
@@ -186,133 +590,594 @@ class List:
         Inserts new Node with value of val in the front of the list
         :param val: value of new Node
         """
-        if self.node.next is self.node and self.node.prev is self.node:
-            temp = Node(val)
-            temp.next = self.node
-            temp.prev = self.node
-            self.node.next = temp
-            self.node.prev = temp
-
-        else:
-            temp = Node(val)
-            temp.next = self.node.next
-            self.node.next.prev = temp
-            temp.prev = self.node
-            self.node.next = temp
+        self._link(self.node.next, val)
 
     def push_back(self, val: Generic[T]) -> None:
         """
         Inserts new Node with value of val in the back of the list
         :param val: value of new Node
         """
-        if self.node.next is self.node and self.node.prev is self.node:
-            temp = Node(val)
-            temp.next = self.node
-            temp.prev = self.node
-            self.node.next = temp
-            self.node.prev = temp
-
-        else:
-            temp = Node(val)
-            temp.next = self.node
-            temp.prev = self.node.prev
-            self.node.prev.next = temp
-            self.node.prev = temp
+        self._link(self.node, val)
 
     def pop_front(self) -> None:
         """
         Erases Node in the front of the list
         """
-        self.node.next = self.node.next.next
-        self.node.next.prev = self.node
+        if self.node.next is not self.node:
+            self._unlink(self.node.next)
 
     def pop_back(self) -> None:
         """
         Erases Node in the back of the list
         """
+        if self.node.prev is not self.node:
+            self._unlink(self.node.prev)
+
+    def __contains__(self, val: Generic[T]) -> bool:
+        """
+        :param val: value to look for
+        :return: True if a node holds a value equal to val else False
+        """
+        return self.contains(val)
 
-        self.node.prev = self.node.prev.prev
-        self.node.prev.next = self.node
+    def contains(self, val: Generic[T]) -> bool:
+        """
+        O(1) with the hash index, a linear walk without it
+        :param val: value to look for
+        :return: True if a node holds a value equal to val else False
+        """
+        if self._index is not None:
+            return val in self._index
+        node = self.node.next
+        while node is not self.node:
+            if node.val == val:
+                return True
+            node = node.next
+        return False
 
     def remove(self, val: Generic[T]) -> None:
         """
-        RECURSIVE
-        Removes all nodes containing a value of val
+        Removes all nodes containing a value equal to val
+        O(k) for k matches with the hash index, a linear walk without it
         :param val: value to remove
         """
+        if self._index is not None:
+            for node in list(self._index.get(val, {}).values()):
+                self._unlink(node)
+            return
 
-        def remove_node(node: Node) -> Node:
-            """remove helper"""
-
-            if node.val is val:
-                node.next.prev = node.prev
-                node.prev.next = node.next
-                remove_node(node.next)
-
-            elif node is self.node:
-                return node
-
-            else:
-                remove_node(node.next)
-        remove_node(self.node.next)
+        node = self.node.next
+        while node is not self.node:
+            if node.val == val:
+                self._unlink(node)
+            node = node.next
 
-    def remove_if(self, pred: Callable[[T], bool]) -> None:
+    def remove_if(self, pred: Callable[[T], bool], pred_vec: Callable = None,
+                  chunk_size: int = BATCH_SIZE) -> None:
         """
-        RECURSIVE
         Removes all Nodes with pred returning True
+        When pred_vec is given and NumPy is installed, values are gathered chunk_size at a time into
+        an array and pred_vec maps it to a boolean mask; chunks that are not numeric use pred instead
         :param pred: predicate function that returns a boolean
+        :param pred_vec: vectorized predicate, ndarray -> boolean ndarray, agreeing with pred
+        :param chunk_size: number of values per pred_vec call
         """
+        if pred_vec is None or np is None:
+            node = self.node.next
+            while node is not self.node:
+                if pred(node.val) == True:
+                    self._unlink(node)
+                node = node.next
+            return
 
-        def remove_node_if(node: Node) -> Node:
-            """remove_if helper"""
-            if node is self.node:
-                return node
-
-            elif pred(node.val) == True:
-                node.next.prev = node.prev
-                node.prev.next = node.next
-                return remove_node_if(node.next)
-
-            return remove_node_if(node.next)
+        self._check_mutable()
+        # survivors are relinked directly unless an index or snapshot has to see each removal
+        relink = self._index is None and self._skip is None and not self._history.live
+        node = self.node.next
+        while node is not self.node:
+            nodes = []
+            while node is not self.node and len(nodes) < chunk_size:
+                nodes.append(node)
+                node = node.next
+            try:
+                values = np.asarray([item.val for item in nodes])
+            except (ValueError, TypeError):  # ragged or nested payloads
+                values = None
+            if values is None or values.dtype.kind not in "biuf" or values.ndim != 1:
+                mask = [pred(item.val) == True for item in nodes]
+            else:
+                mask = np.asarray(pred_vec(values), dtype=bool).tolist()
+            if not relink:
+                for item, hit in zip(nodes, mask):
+                    if hit:
+                        self._unlink(item)
+                continue
 
-        remove_node_if(self.node.next)
+            before, removed = nodes[0].prev, 0
+            for item, hit in zip(nodes, mask):
+                if hit:
+                    removed += 1
+                else:
+                    if item.prev is not before:
+                        before.next = item
+                        item.prev = before
+                    before = item
+            if removed:
+                before.next = node
+                node.prev = before
+                self._size -= removed
+                self._version += 1
 
     def reverse(self) -> None:
         """
-        RECURSIVE
         Reverses linked list in place
         """
-
-        def reverse_list(node: Node) -> None:
-            """reverse helper"""
+        self._check_mutable()
+        self._record_all()
+        node = self.node.next
+        while node is not self.node:
             node.prev, node.next = node.next, node.prev
-            if node is not self.node:
-                return reverse_list(node.next)
-        return reverse_list(self.node.prev)
+            node = node.prev
+        self.node.prev, self.node.next = self.node.next, self.node.prev
+        self._version += 1
+        self._reindex_positions()
 
     def unique(self) -> None:
         """
-        RECURSIVE
         Removes all but one element from every consecutive group of equal elements in the container
         """
+        node = self.node.next
+        while node.next is not self.node:
+            if node.val == node.next.val:
+                self._unlink(node)
+            node = node.next
+
+    def dedupe(self) -> None:
+        """
+        Removes every node whose value equals the value of an earlier node, in one linear pass
+        Values must be hashable
+        """
+        seen = set()
+        node = self.node.next
+        while node is not self.node:
+            if node.val in seen:
+                self._unlink(node)
+            else:
+                seen.add(node.val)
+            node = node.next
+
+    def splice(self, position: Node, other: List, first: Node = None, last: Node = None) -> None:
+        """
+        Moves nodes [first, last) of other before position by relinking them, without allocating
+        When first is not given, moves every node of other
+        When last is not given, moves only first
+        :param position: node of self to insert before
+        :param other: List that owns first and last, may be self
+        :param first: first node to move (inclusive)
+        :param last: node after the last node to move (exclusive)
+        """
+        self._check_mutable()
+        other._check_mutable()
+        if first is None:
+            first, last, count = other.node.next, other.node, other._size
+            if other is not self:
+                other._record_all()
+        else:
+            if last is None:
+                last = first.next
+            count = 0
+            node = first
+            moved = other is not self and other._history.live
+            while node is not last:
+                if moved:
+                    other._record(node)  # later edits are recorded by self, not other
+                node = node.next
+                count += 1
+        if first is last or first is position:
+            return
+
+        if other is not self and (self._index is not None or other._index is not None):
+            node = first
+            while node is not last:
+                if other._index is not None:
+                    other._index_discard(node)
+                if self._index is not None:
+                    self._index_add(node)
+                node = node.next
+
+        tail = last.prev
+        other._record(first.prev, first, tail, last)
+        self._record(position.prev, position)
+        first.prev.next = last
+        last.prev = first.prev
+        tail.next = position
+        first.prev = position.prev
+        position.prev.next = first
+        position.prev = tail
+        other._size -= count
+        self._size += count
+        other._version += 1
+        self._version += 1
+        other._reindex_positions()
+        if other is not self:
+            self._reindex_positions()
+
+    def merge(self, other: List, key: Callable[[T], Generic[T]] = None) -> None:
+        """
+        Merges the nodes of sorted other into sorted self by relinking, leaving other empty
+        Stable: on equal keys nodes of self come before nodes of other
+        :param other: sorted List to merge in
+        :param key: function computing the comparison key of a value, identity when not given
+        """
+        self._check_mutable()
+        other._check_mutable()
+        if other is self or other.empty():
+            return
+        key = key or (lambda val: val)
+        self._record_all()
+        other._record_all()
 
-        def unique_list(node: Node) -> Node:
-            """unique helper"""
-            if node is self.node:
-                return node
+        incoming = other.node.next
+        other.node.prev.next = None
+        count = other._size
+        other.clear()
+        if self._index is not None:
+            node = incoming
+            while node is not None:
+                self._index_add(node)
+                node = node.next
+
+        node = self.node.next
+        while incoming is not None and node is not self.node:
+            if key(incoming.val) < key(node.val):
+                following = incoming.next
+                incoming.prev = node.prev
+                incoming.next = node
+                node.prev.next = incoming
+                node.prev = incoming
+                incoming = following
+            else:
+                node = node.next
 
-            elif node.val is node.next.val:
-                node.next.prev = node.prev
-                node.prev.next = node.next
-                unique_list(node.next)
+        if incoming is not None:
+            incoming.prev = self.node.prev
+            self.node.prev.next = incoming
+            while incoming.next is not None:
+                incoming.next.prev = incoming
+                incoming = incoming.next
+            incoming.next = self.node
+            self.node.prev = incoming
+        self._size += count
+        self._version += 1
+        self._reindex_positions()
 
+    def sort(self, key: Callable[[T], Generic[T]] = None) -> None:
+        """
+        Stable in place merge sort that relinks nodes, O(n log n) without allocating nodes
+        Runs bottom up: sorted runs of length 2^i are kept in bins and merged like a binary counter
+        :param key: function computing the comparison key of a value, identity when not given
+        """
+        self._check_mutable()
+        if self._size < 2:
+            return
+        key = key or (lambda val: val)
+        self._record_all()
+
+        bins = []
+        node = self.node.next
+        self.node.prev.next = None
+        while node is not None:
+            carry, node = node, node.next
+            carry.next = None
+            i = 0
+            while i < len(bins) and bins[i] is not None:
+                carry = _merge_chains(bins[i], carry, key)  # bins hold earlier nodes
+                bins[i] = None
+                i += 1
+            if i == len(bins):
+                bins.append(carry)
             else:
-                unique_list(node.next)
+                bins[i] = carry
+
+        head = None
+        for chain in bins:
+            if chain is not None:
+                head = chain if head is None else _merge_chains(chain, head, key)
+
+        prev = self.node
+        while head is not None:
+            prev.next, head.prev = head, prev
+            prev, head = head, head.next
+        prev.next, self.node.prev = self.node, prev
+        self._version += 1
+        self._reindex_positions()
+
+
+class _History:
+    """
+    Fat node history of the links of one chain of nodes
+    For each edited node, the links it had before its first edit in every epoch
+    A snapshot taken in epoch e reads a link from the first record of a later epoch,
+    or from the node itself when the node was not edited since
+    """
+
+    def __init__(self) -> None:
+        """
+        Starts with no records and no snapshots
+        """
+        self.epoch = 0
+        self.live = 0  # snapshots not yet garbage collected
+        self.records = {}  # id(node) -> (node, [epoch], [(next, prev)])
+
+    def snapshot(self, root: Node, size: int) -> ListSnapshot:
+        """
+        :param root: root node of the chain
+        :param size: number of nodes in the chain
+        :return: view of the chain as of the current epoch, which then ends
+        """
+        view = ListSnapshot(self, self.epoch, root, size)
+        self.epoch += 1
+        self.live += 1
+        finalize(view, self._release)
+        return view
+
+    def _release(self) -> None:
+        """
+        Drops every record once no snapshot can read them
+        """
+        self.live -= 1
+        if not self.live:
+            self.records.clear()
+
+    def record(self, nodes: Iterable[Node]) -> None:
+        """
+        :param nodes: nodes about to be edited in the current epoch
+        """
+        epoch, records = self.epoch, self.records
+        for node in nodes:
+            entry = records.get(id(node))
+            if entry is None:
+                records[id(node)] = (node, [epoch], [(node.next, node.prev)])
+            elif entry[1][-1] != epoch:
+                entry[1].append(epoch)
+                entry[2].append((node.next, node.prev))
+
+    def links(self, node: Node, epoch: int) -> tuple:
+        """
+        :param node: node reached by a snapshot
+        :param epoch: epoch of the snapshot
+        :return: next and prev of node as they were at the end of epoch
+        """
+        entry = self.records.get(id(node))
+        if entry is not None:
+            i = bisect_right(entry[1], epoch)
+            if i < len(entry[1]):
+                return entry[2][i]
+        return node.next, node.prev
+
+
+class ListSnapshot:
+    """
+    Immutable view of a List at the moment List.snapshot was called
+    """
+
+    def __init__(self, history: _History, epoch: int, root: Node, size: int) -> None:
+        """
+        :param history: link history of the chain
+        :param epoch: epoch the view reads
+        :param root: root node of the chain
+        :param size: number of nodes at the snapshot
+        """
+        self._history = history
+        self._epoch = epoch
+        self._root = root
+        self._size = size
+
+    def __repr__(self) -> str:
+        """
+        :return: Represents the snapshot as a string utilizing __str__
+        """
+        return self.__str__()
+
+    def __str__(self) -> str:
+        """
+        :return: string representation of the snapshot, in the format of List
+        """
+        return " <-> ".join("{}".format(val) for val in self)
+
+    def __len__(self) -> int:
+        """
+        :return: number of values in the snapshot
+        """
+        return self._size
+
+    def size(self) -> int:
+        """
+        :return: number of values in the snapshot
+        """
+        return self._size
+
+    def __iter__(self) -> Iterator[T]:
+        """
+        :return: generator over the values from front to back
+        """
+        return self._walk(0)
+
+    def __reversed__(self) -> Iterator[T]:
+        """
+        :return: generator over the values from back to front
+        """
+        return self._walk(1)
+
+    def _walk(self, link: int) -> Iterator[T]:
+        """
+        Raises RuntimeError if the walk does not return to the root within the size of the snapshot
+        :param link: 0 to follow next links, 1 to follow prev links
+        :return: generator over the values
+        """
+        links, epoch, root = self._history.links, self._epoch, self._root
+        remaining = self._size
+        node = links(root, epoch)[link]
+        while node is not root:
+            if node is None or remaining == 0:
+                raise RuntimeError("Snapshot history is broken")
+            yield node.val
+            remaining -= 1
+            node = links(node, epoch)[link]
+
+    def __eq__(self, other) -> bool:
+        """
+        :param other: ListSnapshot or List to compare with
+        :return: True if both hold equal values in the same order otherwise False
+        """
+        if other.size() != self._size:
+            return False
+        return all(mine == theirs for mine, theirs in zip(self, other))
+
+    def to_list(self) -> List:
+        """
+        :return: new mutable List holding the values of the snapshot
+        """
+        return List.from_iterable(self)
+
+
+def _merge_chains(first: Node, second: Node, key: Callable[[T], Generic[T]]) -> Node:
+    """
+    Stable merge of two sorted None terminated chains linked through next
+    :param first: head of the chain whose nodes win ties
+    :param second: head of the other chain
+    :param key: function computing the comparison key of a value
+    :return: head of the merged chain
+    """
+    if key(second.val) < key(first.val):
+        head, second = second, second.next
+    else:
+        head, first = first, first.next
+    tail = head
+    while first is not None and second is not None:
+        if key(second.val) < key(first.val):
+            tail.next, tail, second = second, second, second.next
+        else:
+            tail.next, tail, first = first, first, first.next
+    tail.next = first if first is not None else second
+    return head
 
-        unique_list(self.node.next)
 
 # Application Problem
 
+class PlaylistDiagnosis(NamedTuple):
+    """
+    Shape of the chain of links followed from the root node of a playlist
+    """
+    status: str  # PROPER, BROKEN or IMPROPER
+    tail_length: int  # links followed from the root before entering the cycle, or before None when broken
+    cycle_length: int  # nodes on the cycle, the root included when proper, 0 when broken
+    cycle_entry: Optional[Node]  # first node on the cycle, the root when proper, None when broken
+    break_point: Optional[Node]  # node whose link is wrong: ends in None or wraps to cycle_entry; None when proper
+
+
+PROPER, BROKEN, IMPROPER = "proper", "broken", "improper"
+
+
+def diagnose_playlist(lst: List, direction: str = "next") -> PlaylistDiagnosis:
+    """
+    Iterative Floyd cycle detection over the links of lst, O(n) time and O(1) extra memory
+    It is broken when the links end in None
+    It is improper when the links form a cycle that does not pass through the root node
+    :param lst: List to inspect, not modified
+    :param direction: "next" to follow next links or "prev" to follow prev links
+    :return: status, tail and cycle lengths, cycle entry and break point of lst
+    """
+    step = _step(direction)
+    root = lst.node
+
+    slow = fast = root
+    while True:
+        if step(fast) is None:
+            return _diagnose_broken(root, fast, step)
+        if step(step(fast)) is None:
+            return _diagnose_broken(root, step(fast), step)
+        slow, fast = step(slow), step(step(fast))
+        if slow is fast:
+            break
+
+    entry, tail_length = root, 0
+    while entry is not slow:
+        entry, slow = step(entry), step(slow)
+        tail_length += 1
+
+    break_point, cycle_length = entry, 1
+    while step(break_point) is not entry:
+        break_point = step(break_point)
+        cycle_length += 1
+
+    if entry is root:
+        return PlaylistDiagnosis(PROPER, 0, cycle_length, root, None)
+    return PlaylistDiagnosis(IMPROPER, tail_length, cycle_length, entry, break_point)
+
+
+def _diagnose_broken(root: Node, last: Node, step: Callable[[Node], Node]) -> PlaylistDiagnosis:
+    """
+    :param root: root node of the playlist
+    :param last: node whose link is None
+    :param step: follows one link
+    :return: diagnosis of a playlist whose links end at last
+    """
+    tail_length, node = 0, root
+    while node is not last:
+        node = step(node)
+        tail_length += 1
+    return PlaylistDiagnosis(BROKEN, tail_length, 0, None, last)
+
+
+def _step(direction: str) -> Callable[[Node], Node]:
+    """
+    :param direction: "next" or "prev"
+    :return: function following one link in direction
+    """
+    if direction in ("next", "prev"):
+        return attrgetter(direction)
+    raise ValueError("direction must be 'next' or 'prev', not {!r}".format(direction))
+
+
+def repair_playlist(lst: List, direction: str = "next") -> bool:
+    """
+    Trusts the links in direction, closes them back to the root when broken,
+    then rebuilds every link in the other direction and the cached size from them
+    Improper playlists are left untouched
+    :param lst: List to repair in place
+    :param direction: "next" to trust next links or "prev" to trust prev links
+    :raises TypeError: if lst is frozen and not improper
+    :return: True if lst is proper afterwards else False
+    """
+    diagnosis = diagnose_playlist(lst, direction)
+    if diagnosis.status == IMPROPER:
+        return False
+
+    lst._check_mutable()
+    root = lst.node
+    if diagnosis.status == BROKEN:
+        setattr(diagnosis.break_point, direction, root)
+        size = diagnosis.tail_length
+    else:
+        size = diagnosis.cycle_length - 1
+
+    back = "prev" if direction == "next" else "next"
+    node = root
+    while True:
+        following = getattr(node, direction)
+        setattr(following, back, node)
+        node = following
+        if node is root:
+            break
+    lst._size = size
+    lst._version += 1
+    lst._reindex_positions()
+    if lst._index is not None:
+        lst.build_index()  # truncation may have dropped indexed nodes
+    return True
+
+
 def fix_playlist(lst: List) -> bool:
     """
     Checks if the given lst is proper, broken, or improper
@@ -322,32 +1187,4 @@ def fix_playlist(lst: List) -> bool:
     :param lst: List to check and fix cycle
     :return: True if proper or fixed broken cycle else False
     """
-    if lst.node.next is lst.node and lst.node.prev is lst.node:
-        return True
-
-    else:
-        def fix_playlist_helper(slow: Node, fast: Node) -> bool:
-            """fix_playlist helper"""
-            if slow.next is None:
-                slow.next = lst.node
-                lst.node.prev = slow.next
-                return True
-
-            elif fast.next is None:
-                fast.next = lst.node
-                lst.node.prev = fast.next
-                return True
-
-            elif fast.next.next is None:
-                fast.next.next = lst.node
-                lst.node.prev = fast.next
-                return True
-
-            else:
-                if fast.next.next is slow.next and fast.next.next is lst.node:
-                    return True
-                elif fast.next.next is slow.next and fast.next.next is not lst.node:
-                    return False
-                return fix_playlist_helper(slow.next, fast.next.next)
-
-        return fix_playlist_helper(lst.node, lst.node)
\ No newline at end of file
+    return repair_playlist(lst, "next")
@@ -0,0 +1,425 @@
+"""
+PROJECT 1 - Doubly Linked List - Compact Node Pool
+Stores val, next and prev of every node in parallel preallocated arrays
+indexed by integer handles instead of one Python object per node
+"""
+
+from __future__ import annotations  # allow self-reference
+from array import array
+from typing import TypeVar, Generic, Callable, Iterable  # function type
+
+T = TypeVar("T")
+
+ROOT = 0  # handle of the root node of every pool
+NIL = -1  # end of the free list
+
+
+class NodePool:
+    """
+    Parallel arrays holding the fields of every node
+    Erased slots are chained through the next array into a free list
+    """
+
+    def __init__(self, capacity: int = 16) -> None:
+        """
+        Allocates room for capacity nodes and links the root node to itself
+        :param capacity: number of slots to preallocate, including the root
+        """
+        capacity = max(capacity, 1)
+        self.vals = [None] * capacity
+        self.next = array("q", [ROOT]) * capacity
+        self.prev = array("q", [ROOT]) * capacity
+        self.top = 1  # first slot never handed out
+        self.free = NIL
+        self.anchor = PoolNode(self, ROOT)  # the one handle to the root, so identity checks work
+
+    def capacity(self) -> int:
+        """
+        :return: number of slots currently allocated
+        """
+        return len(self.vals)
+
+    def allocate(self, val: Generic[T]) -> int:
+        """
+        Takes a slot from the free list, or the next unused slot, growing the arrays when full
+        :param val: value to store in the slot
+        :return: handle of the slot
+        """
+        if self.free != NIL:
+            index = self.free
+            self.free = self.next[index]
+        else:
+            if self.top == len(self.vals):
+                self._grow()
+            index = self.top
+            self.top += 1
+        self.vals[index] = val
+        return index
+
+    def release(self, index: int) -> None:
+        """
+        Returns a slot to the free list and drops its value
+        :param index: handle of the slot
+        """
+        self.vals[index] = None
+        self.next[index] = self.free
+        self.free = index
+
+    def reset(self) -> None:
+        """
+        Releases every slot except the root
+        """
+        for index in range(1, self.top):
+            self.vals[index] = None
+        self.top = 1
+        self.free = NIL
+        self.next[ROOT] = self.prev[ROOT] = ROOT
+
+    def _grow(self) -> None:
+        """
+        Doubles the capacity of every array
+        """
+        extra = len(self.vals)
+        self.vals.extend([None] * extra)
+        self.next.extend(array("q", [ROOT]) * extra)
+        self.prev.extend(array("q", [ROOT]) * extra)
+
+
+class PoolNode:
+    """
+    Lightweight handle to a node of a NodePool
+    Mirrors the val, next and prev attributes of DoublyLinkedListNode
+    A handle to an erased node is invalid; its slot may be reused
+    """
+
+    __slots__ = ("pool", "index")
+
+    def __init__(self, pool: NodePool, index: int) -> None:
+        """
+        :param pool: pool holding the node
+        :param index: handle of the node in pool
+        """
+        self.pool = pool
+        self.index = index
+
+    @property
+    def val(self) -> Generic[T]:
+        """:return: value of node"""
+        return self.pool.vals[self.index]
+
+    @val.setter
+    def val(self, val: Generic[T]) -> None:
+        """:param val: new value of node"""
+        self.pool.vals[self.index] = val
+
+    @property
+    def next(self) -> PoolNode:
+        """:return: handle of the next node"""
+        return _handle(self.pool, self.pool.next[self.index])
+
+    @property
+    def prev(self) -> PoolNode:
+        """:return: handle of the previous node"""
+        return _handle(self.pool, self.pool.prev[self.index])
+
+    def __str__(self):
+        """:return: string representation of node"""
+        return str(self.val)
+
+    def __repr__(self):
+        """:return: string representation of node"""
+        return self.__str__()
+
+    def __eq__(self, other: [PoolNode, Generic[T]]):
+        """
+        == operation
+        :param other: item to compare
+        :return: True if self is equal to other else False
+        """
+        if type(other) == PoolNode:
+            return self.val == other.val
+        return self.val == other
+
+
+def _handle(pool: NodePool, index: int) -> PoolNode:
+    """
+    :return: the root handle when index is the root, otherwise a new handle
+    """
+    if index == ROOT:
+        return pool.anchor
+    return PoolNode(pool, index)
+
+
+class PooledList:
+    """
+    List with the same interface as Project1.List.List whose nodes live in a NodePool
+    Positions passed to and returned from insert and erase are PoolNode handles
+    """
+
+    debug = False  # when True, size() verifies the cached length with a full walk
+
+    def __init__(self, num: int = None, val: Generic[T] = None, container: Iterable = None,
+                 capacity: int = 16) -> None:
+        """
+        Creates the pool, whose slot 0 is the root node
+        Assigns list with param values given
+        :param num: count of val occurrences
+        :param val: value to be stored in Node
+        :param container: contains elements used in assign
+        :param capacity: number of nodes to preallocate
+        """
+        self.pool = NodePool(capacity)
+        self.node = self.pool.anchor
+        self._size = 0
+
+        if num or container:
+            self.assign(num, val, container)
+
+    def __repr__(self) -> str:
+        """
+        :return: Represents the list as a string utilizing __str__
+        """
+        return self.__str__()
+
+    def __eq__(self, other) -> bool:
+        """
+        :param other: PooledList or List to compare with
+        :return: True if both hold equal values in the same order otherwise False
+        """
+        if isinstance(other, PooledList):
+            if self._size != other._size:
+                return False
+            vals, nxt = self.pool.vals, self.pool.next
+            other_vals, other_nxt = other.pool.vals, other.pool.next
+            index, other_index = nxt[ROOT], other_nxt[ROOT]
+            while index != ROOT:
+                if vals[index] != other_vals[other_index]:
+                    return False
+                index, other_index = nxt[index], other_nxt[other_index]
+            return True
+
+        vals, nxt = self.pool.vals, self.pool.next
+        index, node = nxt[ROOT], other.node.next
+        while index != ROOT and node is not other.node:
+            if node != vals[index]:
+                return False
+            index, node = nxt[index], node.next
+        return index == ROOT and node is other.node
+
+    def assign(self, num: int = None, val: Generic[T] = None, container: Iterable = None) -> None:
+        """
+        Populates self with nodes using the given parameters
+        :param num: represents the number of occurrences of val to assign to list
+        :param val: value to have n occurrences
+        :param container: used to generate nodes with its contents
+        """
+        self.clear()
+        if container:
+            for item in container:
+                self.push_back(item)
+        elif num:
+            for _ in range(num):
+                self.push_back(val)
+
+    def clear(self) -> None:
+        """
+        Releases every node back to the pool
+        """
+        self.pool.reset()
+        self._size = 0
+
+    def empty(self) -> bool:
+        """
+        :return: True if List contains no nodes other than the root node else False
+        """
+        return self.pool.next[ROOT] == ROOT
+
+    def front(self) -> PoolNode:
+        """
+        :return: first node in the list or root node if empty
+        """
+        if self.empty():
+            return self.node
+        return PoolNode(self.pool, self.pool.next[ROOT])
+
+    def back(self) -> PoolNode:
+        """
+        :return: last node in the list or root node if empty
+        """
+        if self.empty():
+            return self.node
+        return PoolNode(self.pool, self.pool.prev[ROOT])
+
+    def swap(self, other: PooledList) -> None:
+        """
+        :param other: PooledList to swap contents
+        """
+        self.pool, other.pool = other.pool, self.pool
+        self.node, other.node = other.node, self.node
+        self._size, other._size = other._size, self._size
+
+    def __str__(self) -> str:
+        """
+        :return: string representation of linked list
+        """
+        vals, nxt = self.pool.vals, self.pool.next
+        parts = []
+        index = nxt[ROOT]
+        while index != ROOT:
+            parts.append("{}".format(vals[index]))
+            index = nxt[index]
+        return " <-> ".join(parts)
+
+    def size(self) -> int:
+        """
+        Constant time; the length is maintained by every mutator
+        :return: size of list or number of nodes not including the root node
+        """
+        if self.debug:
+            self.check_size()
+        return self._size
+
+    def check_size(self) -> None:
+        """
+        Debug consistency check of the cached length against a full walk of the list
+        :raises RuntimeError: if the cached length does not match the number of nodes
+        """
+        nxt = self.pool.next
+        count = 0
+        index = nxt[ROOT]
+        while index != ROOT:
+            count += 1
+            index = nxt[index]
+        if count != self._size:
+            raise RuntimeError("cached size {} does not match {} nodes".format(self._size, count))
+
+    def _link(self, position: int, val: Generic[T]) -> int:
+        """
+        Allocates a node holding val and links it before position
+        :param position: handle to insert before
+        :param val: value of new node
+        :return: handle of the new node
+        """
+        pool = self.pool
+        index = pool.allocate(val)
+        before = pool.prev[position]
+        pool.next[index], pool.prev[index] = position, before
+        pool.next[before] = pool.prev[position] = index
+        self._size += 1
+        return index
+
+    def _unlink(self, index: int) -> int:
+        """
+        Unlinks a node and returns its slot to the pool
+        :param index: handle to remove, never the root
+        :return: handle of the node that followed the removed node
+        """
+        pool = self.pool
+        after, before = pool.next[index], pool.prev[index]
+        pool.prev[after] = before
+        pool.next[before] = after
+        pool.release(index)
+        self._size -= 1
+        return after
+
+    def insert(self, position: PoolNode, val: Generic[T], num: int = 1) -> PoolNode:
+        """
+        Places node before given position with a value of val
+        When num is given, insert num occurrences of node
+        :param position: node to insert new node before
+        :param val: value to insert
+        :param num: number of insertions of val at position index
+        :return: node that points to the first of the newly inserted nodes
+        """
+        index = position.index
+        for _ in range(num):
+            index = self._link(index, val)
+        return PoolNode(self.pool, index)
+
+    def erase(self, first: PoolNode, last: PoolNode = None) -> PoolNode:
+        """
+        Erases node or nodes in list from first to, but not including last: [first, last)
+        When last is not given, erase only first node
+        :param first: position to start erasing (inclusive)
+        :param last: position to end erasing (exclusive)
+        :return: node that followed the last node erased
+        """
+        if first.index == ROOT:
+            return first
+        stop = self.pool.next[first.index] if last is None else last.index
+        index = first.index
+        while index != stop:
+            index = self._unlink(index)
+        return _handle(self.pool, stop)
+
+    def push_front(self, val: Generic[T]) -> None:
+        """
+        Inserts new node with value of val in the front of the list
+        :param val: value of new node
+        """
+        self._link(self.pool.next[ROOT], val)
+
+    def push_back(self, val: Generic[T]) -> None:
+        """
+        Inserts new node with value of val in the back of the list
+        :param val: value of new node
+        """
+        self._link(ROOT, val)
+
+    def pop_front(self) -> None:
+        """
+        Erases node in the front of the list
+        """
+        if not self.empty():
+            self._unlink(self.pool.next[ROOT])
+
+    def pop_back(self) -> None:
+        """
+        Erases node in the back of the list
+        """
+        if not self.empty():
+            self._unlink(self.pool.prev[ROOT])
+
+    def remove(self, val: Generic[T]) -> None:
+        """
+        Removes all nodes containing a value equal to val
+        :param val: value to remove
+        """
+        self.remove_if(lambda x: x == val)
+
+    def remove_if(self, pred: Callable[[T], bool]) -> None:
+        """
+        Removes all nodes with pred returning True
+        :param pred: predicate function that returns a boolean
+        """
+        vals, nxt = self.pool.vals, self.pool.next
+        index = nxt[ROOT]
+        while index != ROOT:
+            if pred(vals[index]) == True:
+                index = self._unlink(index)
+            else:
+                index = nxt[index]
+
+    def reverse(self) -> None:
+        """
+        Reverses linked list in place by swapping the next and prev of every node
+        """
+        nxt, prv = self.pool.next, self.pool.prev
+        index = ROOT
+        while True:
+            nxt[index], prv[index] = prv[index], nxt[index]
+            index = prv[index]
+            if index == ROOT:
+                break
+
+    def unique(self) -> None:
+        """
+        Removes all but one element from every consecutive group of equal elements in the container
+        """
+        vals, nxt = self.pool.vals, self.pool.next
+        index = nxt[ROOT]
+        while index != ROOT and nxt[index] != ROOT:
+            if vals[index] == vals[nxt[index]]:
+                index = self._unlink(index)
+            else:
+                index = nxt[index]
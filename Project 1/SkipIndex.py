@@ -0,0 +1,157 @@
+"""
+PROJECT 1 - Doubly Linked List - Skip List Position Index
+Indexable skip list layered over the nodes of a List for O(log n) positional access
+"""
+
+from __future__ import annotations  # allow self-reference
+from random import random
+from typing import Iterable, List as PyList
+
+MAX_LEVEL = 32
+PROMOTION = 0.5  # chance a tower grows one more level
+
+
+class Tower:
+    """
+    Column of skip list links above one list node
+    width[level] counts the positions spanned by next[level]
+    """
+
+    __slots__ = ("node", "next", "prev", "width")
+
+    def __init__(self, node, height: int) -> None:
+        """
+        :param node: list node the tower stands on, None for the head and tail
+        :param height: number of levels
+        """
+        self.node = node
+        self.next: PyList[Tower] = [None] * height
+        self.prev: PyList[Tower] = [None] * height
+        self.width: PyList[int] = [0] * height
+
+
+def _random_height() -> int:
+    """
+    :return: geometric random tower height in [1, MAX_LEVEL]
+    """
+    height = 1
+    while height < MAX_LEVEL and random() < PROMOTION:
+        height += 1
+    return height
+
+
+class SkipIndex:
+    """
+    Skip list whose bottom level holds one tower per list node in list order
+    The head tower sits at position 0 and the node at index i at position i + 1
+    """
+
+    def __init__(self, nodes: Iterable = ()) -> None:
+        """
+        Builds the index in O(n) by appending each node
+        :param nodes: list nodes in list order
+        """
+        self.head = Tower(None, MAX_LEVEL)
+        self.tail = Tower(None, MAX_LEVEL)
+        self.towers = {}  # id(node) -> Tower
+        self.size = 0
+
+        last = [self.head] * MAX_LEVEL
+        last_position = [0] * MAX_LEVEL
+        for node in nodes:
+            self.size += 1
+            tower = Tower(node, _random_height())
+            self.towers[id(node)] = tower
+            for level in range(len(tower.next)):
+                before = last[level]
+                before.next[level], tower.prev[level] = tower, before
+                before.width[level] = self.size - last_position[level]
+                last[level], last_position[level] = tower, self.size
+        for level in range(MAX_LEVEL):
+            before = last[level]
+            before.next[level], self.tail.prev[level] = self.tail, before
+            before.width[level] = self.size + 1 - last_position[level]
+
+    def at(self, index: int):
+        """
+        :param index: 0 based index, 0 <= index < size
+        :return: list node at index
+        """
+        tower, remaining = self.head, index + 1
+        for level in range(MAX_LEVEL - 1, -1, -1):
+            while tower.width[level] <= remaining:
+                remaining -= tower.width[level]
+                tower = tower.next[level]
+        return tower.node
+
+    def index_of(self, node) -> int:
+        """
+        Retraces the search path from the tower of node back to the head
+        :param node: list node in the index
+        :return: 0 based index of node
+        """
+        tower = self.towers[id(node)]
+        position = 0
+        while tower is not self.head:
+            top = len(tower.next) - 1
+            tower = tower.prev[top]
+            position += tower.width[top]
+        return position - 1
+
+    def insert(self, index: int, node) -> None:
+        """
+        Places node so that it ends up at index, shifting later nodes back by one
+        :param index: 0 based index, 0 <= index <= size
+        :param node: list node to add
+        """
+        update, update_position = self._predecessors(index)
+        position = index + 1
+        tower = Tower(node, _random_height())
+        self.towers[id(node)] = tower
+        for level in range(MAX_LEVEL):
+            before = update[level]
+            if level < len(tower.next):
+                after = before.next[level]
+                tower.next[level], tower.prev[level] = after, before
+                before.next[level] = after.prev[level] = tower
+                tower.width[level] = before.width[level] + update_position[level] + 1 - position
+                before.width[level] = position - update_position[level]
+            else:
+                before.width[level] += 1
+        self.size += 1
+
+    def remove(self, node) -> None:
+        """
+        Unlinks the tower of node, shifting later nodes forward by one
+        :param node: list node in the index
+        """
+        tower = self.towers.pop(id(node))
+        height = len(tower.next)
+        level, before = 0, tower
+        while level < MAX_LEVEL:
+            if level < height:
+                before, after = tower.prev[level], tower.next[level]
+                before.next[level], after.prev[level] = after, before
+                before.width[level] += tower.width[level] - 1
+                level += 1
+            else:
+                while len(before.next) <= level:  # climb to a tower tall enough for this level
+                    before = before.prev[len(before.next) - 1]
+                before.width[level] -= 1
+                level += 1
+        self.size -= 1
+
+    def _predecessors(self, index: int):
+        """
+        :param index: 0 based index
+        :return: rightmost tower before position index + 1 at every level, and their positions
+        """
+        update = [self.head] * MAX_LEVEL
+        update_position = [0] * MAX_LEVEL
+        tower, position = self.head, 0
+        for level in range(MAX_LEVEL - 1, -1, -1):
+            while position + tower.width[level] <= index:
+                position += tower.width[level]
+                tower = tower.next[level]
+            update[level], update_position[level] = tower, position
+        return update, update_position
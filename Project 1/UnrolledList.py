@@ -0,0 +1,557 @@
+"""
+PROJECT 1 - Doubly Linked List - Unrolled Storage
+Cyclic doubly linked list of chunks, each holding a small Python list of values,
+so traversals touch one object per chunk instead of one per value
+"""
+
+from __future__ import annotations  # allow self-reference
+from itertools import islice
+from typing import TypeVar, Generic, Callable, Iterable, Iterator
+from weakref import ref
+
+T = TypeVar("T")
+
+CHUNK_SIZE = 64
+
+
+class Chunk:
+    """
+    Node of the chunk list
+    cursors maps id(cursor) to a weak reference of every live cursor into values, created on first use
+    (cursors compare by value like list nodes, so they cannot be kept in a set)
+    anchor is the cursor of the root chunk, None for every other chunk
+    """
+
+    __slots__ = ("values", "next", "prev", "cursors", "anchor")
+
+    def __init__(self, values: list = None) -> None:
+        """
+        :param values: values of the chunk, empty when not given
+        """
+        self.values = values if values is not None else []
+        self.next = self.prev = self
+        self.cursors = None
+        self.anchor = None
+
+    def track(self, cursor: Cursor) -> None:
+        """
+        :param cursor: cursor whose offset must follow later changes to values
+        """
+        if self.cursors is None:
+            self.cursors = {}
+        cursors, key = self.cursors, id(cursor)
+        cursors[key] = ref(cursor, lambda _: cursors.pop(key, None))
+
+    def untrack(self, cursor: Cursor) -> None:
+        """
+        :param cursor: cursor that left this chunk
+        """
+        del self.cursors[id(cursor)]
+
+    def live_cursors(self) -> list:
+        """
+        :return: copy of the cursors into this chunk
+        """
+        if not self.cursors:
+            return []
+        return [cursor for cursor in (weak() for weak in list(self.cursors.values())) if cursor is not None]
+
+
+class Cursor:
+    """
+    Stable position of one value of an UnrolledList, standing in for a list node
+    Kept pointing at the same value through chunk splits and merges
+    A cursor to an erased value is invalid
+    """
+
+    __slots__ = ("root", "chunk", "offset", "__weakref__")
+
+    def __init__(self, root: Chunk, chunk: Chunk, offset: int) -> None:
+        """
+        :param root: root chunk of the list
+        :param chunk: chunk holding the value
+        :param offset: index of the value in chunk
+        """
+        self.root = root
+        self.chunk = chunk
+        self.offset = offset
+        if chunk is not root:
+            chunk.track(self)
+
+    def _check(self) -> None:
+        """
+        :raises ValueError: if the value of the cursor was erased
+        """
+        if self.chunk is None:
+            raise ValueError("cursor refers to an erased value")
+
+    @property
+    def val(self) -> Generic[T]:
+        """:return: value at the cursor, None for the root"""
+        self._check()
+        return None if self.chunk is self.root else self.chunk.values[self.offset]
+
+    @val.setter
+    def val(self, val: Generic[T]) -> None:
+        """:param val: new value at the cursor"""
+        self._check()
+        self.chunk.values[self.offset] = val
+
+    @property
+    def next(self) -> Cursor:
+        """:return: cursor to the following value, or the root cursor"""
+        self._check()
+        if self.chunk is not self.root and self.offset + 1 < len(self.chunk.values):
+            return Cursor(self.root, self.chunk, self.offset + 1)
+        return _cursor(self.root, self.chunk.next, 0)
+
+    @property
+    def prev(self) -> Cursor:
+        """:return: cursor to the preceding value, or the root cursor"""
+        self._check()
+        if self.chunk is not self.root and self.offset > 0:
+            return Cursor(self.root, self.chunk, self.offset - 1)
+        chunk = self.chunk.prev
+        return _cursor(self.root, chunk, len(chunk.values) - 1)
+
+    def same(self, other: Cursor) -> bool:
+        """
+        :param other: cursor to compare positions with
+        :return: True if both cursors refer to the same value else False
+        """
+        return self.chunk is other.chunk and (self.chunk is self.root or self.offset == other.offset)
+
+    def __str__(self):
+        """:return: string representation of node"""
+        return str(self.val)
+
+    def __repr__(self):
+        """:return: string representation of node"""
+        return self.__str__()
+
+    def __eq__(self, other: [Cursor, Generic[T]]):
+        """
+        == operation
+        :param other: item to compare
+        :return: True if self is equal to other else False
+        """
+        if type(other) == Cursor:
+            return self.val == other.val
+        return self.val == other
+
+
+def _cursor(root: Chunk, chunk: Chunk, offset: int) -> Cursor:
+    """
+    :return: the root cursor when chunk is the root, otherwise a new cursor
+    """
+    if chunk is root:
+        return root.anchor
+    return Cursor(root, chunk, offset)
+
+
+class UnrolledList:
+    """
+    List with the same interface as Project1.List.List whose nodes are chunks of values
+    Chunks split when an insertion overflows them and merge with a neighbour when erasures
+    leave them a quarter full. Positions passed to and returned from insert and erase are Cursors.
+    """
+
+    debug = False  # when True, size() verifies the cached length with a full walk
+
+    def __init__(self, num: int = None, val: Generic[T] = None, container: Iterable = None,
+                 chunk_size: int = CHUNK_SIZE) -> None:
+        """
+        Creates root chunk and its cursor
+        Assigns list with param values given
+        :param num: count of val occurrences
+        :param val: value to be stored in Node
+        :param container: contains elements used in assign
+        :param chunk_size: most values per chunk
+        """
+        self.chunk_size = max(chunk_size, 2)
+        self._root = Chunk()
+        self.node = self._root.anchor = Cursor(self._root, self._root, 0)
+        self._size = 0
+
+        if num or container:
+            self.assign(num, val, container)
+
+    def __repr__(self) -> str:
+        """
+        :return: Represents the list as a string utilizing __str__
+        """
+        return self.__str__()
+
+    def __eq__(self, other) -> bool:
+        """
+        :param other: UnrolledList, List or PooledList to compare with
+        :return: True if both hold equal values in the same order otherwise False
+        """
+        if self._size != other.size():
+            return False
+        node = other.node.next
+        for val in self:
+            if node is other.node or val != node.val:
+                return False
+            node = node.next
+        return node is other.node
+
+    def __iter__(self) -> Iterator[T]:
+        """
+        :return: generator over the values from front to back
+        """
+        chunk = self._root.next
+        while chunk is not self._root:
+            yield from chunk.values
+            chunk = chunk.next
+
+    def __reversed__(self) -> Iterator[T]:
+        """
+        :return: generator over the values from back to front
+        """
+        chunk = self._root.prev
+        while chunk is not self._root:
+            yield from reversed(chunk.values)
+            chunk = chunk.prev
+
+    def assign(self, num: int = None, val: Generic[T] = None, container: Iterable = None) -> None:
+        """
+        Populates self with full chunks using the given parameters
+        :param num: represents the number of occurrences of val to assign to list
+        :param val: value to have n occurrences
+        :param container: used to generate nodes with its contents
+        """
+        self.clear()
+        if container:
+            items = iter(container)
+            values = list(islice(items, self.chunk_size))
+            while values:
+                self._append_chunk(values)
+                values = list(islice(items, self.chunk_size))
+        elif num:
+            for start in range(0, num, self.chunk_size):
+                self._append_chunk([val] * min(self.chunk_size, num - start))
+
+    def clear(self) -> None:
+        """
+        Unlinks every chunk and invalidates every cursor into them
+        """
+        chunk = self._root.next
+        while chunk is not self._root:
+            for cursor in chunk.live_cursors():
+                cursor.chunk = None
+            chunk = chunk.next
+        self._root.next = self._root.prev = self._root
+        self._size = 0
+
+    def empty(self) -> bool:
+        """
+        :return: True if List contains no values else False
+        """
+        return self._root.next is self._root
+
+    def front(self) -> Cursor:
+        """
+        :return: cursor to the first value or root cursor if empty
+        """
+        return _cursor(self._root, self._root.next, 0)
+
+    def back(self) -> Cursor:
+        """
+        :return: cursor to the last value or root cursor if empty
+        """
+        chunk = self._root.prev
+        return _cursor(self._root, chunk, len(chunk.values) - 1)
+
+    def swap(self, other: UnrolledList) -> None:
+        """
+        :param other: UnrolledList to swap contents
+        """
+        self._root, other._root = other._root, self._root
+        self.node, other.node = other.node, self.node
+        self._size, other._size = other._size, self._size
+        self.chunk_size, other.chunk_size = other.chunk_size, self.chunk_size
+
+    def __str__(self) -> str:
+        """
+        :return: string representation of linked list
+        """
+        return " <-> ".join(map("{}".format, self))
+
+    def size(self) -> int:
+        """
+        Constant time; the length is maintained by every mutator
+        :return: number of values in the list
+        """
+        if self.debug:
+            self.check_size()
+        return self._size
+
+    def check_size(self) -> None:
+        """
+        Debug consistency check of the cached length against a full walk of the chunks
+        :raises RuntimeError: if the cached length does not match the number of values
+        """
+        count = 0
+        chunk = self._root.next
+        while chunk is not self._root:
+            count += len(chunk.values)
+            chunk = chunk.next
+        if count != self._size:
+            raise RuntimeError("cached size {} does not match {} values".format(self._size, count))
+
+    def insert(self, position: Cursor, val: Generic[T], num: int = 1) -> Cursor:
+        """
+        Places value before given position
+        When num is given, insert num occurrences of val
+        :param position: cursor to insert new value before
+        :param val: value to insert
+        :param num: number of insertions of val at position index
+        :return: cursor to the first of the newly inserted values
+        """
+        for _ in range(num):
+            position = self._insert(position, val)
+        return position
+
+    def erase(self, first: Cursor, last: Cursor = None) -> Cursor:
+        """
+        Erases value or values in list from first to, but not including last: [first, last)
+        When last is not given, erase only first
+        :param first: position to start erasing (inclusive)
+        :param last: position to end erasing (exclusive)
+        :return: cursor to the value that followed the last value erased
+        """
+        if first.chunk is self._root:
+            return first
+        if last is None:
+            return self._erase(first)
+        while not first.same(last):
+            first = self._erase(first)
+        return last
+
+    def push_front(self, val: Generic[T]) -> None:
+        """
+        Inserts val in the front of the list
+        :param val: value to insert
+        """
+        self._insert(self.front(), val)
+
+    def push_back(self, val: Generic[T]) -> None:
+        """
+        Inserts val in the back of the list
+        :param val: value to insert
+        """
+        self._insert(self.node, val)
+
+    def pop_front(self) -> None:
+        """
+        Erases the value in the front of the list
+        """
+        if not self.empty():
+            self._erase(self.front())
+
+    def pop_back(self) -> None:
+        """
+        Erases the value in the back of the list
+        """
+        if not self.empty():
+            self._erase(self.back())
+
+    def remove(self, val: Generic[T]) -> None:
+        """
+        Removes all values equal to val
+        :param val: value to remove
+        """
+        self._retain(lambda x: not x == val)
+
+    def remove_if(self, pred: Callable[[T], bool]) -> None:
+        """
+        Removes all values with pred returning True, filtering a chunk at a time
+        :param pred: predicate function that returns a boolean
+        """
+        self._retain(lambda x: not pred(x) == True)
+
+    def reverse(self) -> None:
+        """
+        Reverses the chunk order and the values of every chunk in place
+        """
+        chunk = self._root
+        while True:
+            chunk.next, chunk.prev = chunk.prev, chunk.next
+            if chunk is not self._root:
+                chunk.values.reverse()
+                last = len(chunk.values) - 1
+                for cursor in chunk.live_cursors():
+                    cursor.offset = last - cursor.offset
+            chunk = chunk.next
+            if chunk is self._root:
+                break
+
+    def unique(self) -> None:
+        """
+        Removes all but one element from every consecutive group of equal elements in the container
+        """
+        previous = []  # last kept value, empty before the first
+
+        def keep(val: Generic[T]) -> bool:
+            """unique filter"""
+            if previous and previous[0] == val:
+                return False
+            previous[:] = [val]
+            return True
+
+        self._retain(keep)
+
+    def _append_chunk(self, values: list) -> Chunk:
+        """
+        :param values: values of the new last chunk
+        :return: the new chunk
+        """
+        chunk = Chunk(values)
+        self._link_chunk(chunk, self._root.prev)
+        self._size += len(values)
+        return chunk
+
+    @staticmethod
+    def _link_chunk(chunk: Chunk, after: Chunk) -> None:
+        """
+        :param chunk: chunk to link
+        :param after: chunk to link it after
+        """
+        chunk.prev, chunk.next = after, after.next
+        after.next.prev = chunk
+        after.next = chunk
+
+    @staticmethod
+    def _unlink_chunk(chunk: Chunk) -> None:
+        """
+        :param chunk: chunk to unlink
+        """
+        chunk.prev.next = chunk.next
+        chunk.next.prev = chunk.prev
+
+    def _insert(self, position: Cursor, val: Generic[T]) -> Cursor:
+        """
+        :param position: cursor to insert before
+        :param val: value to insert
+        :return: cursor to the new value
+        """
+        position._check()
+        chunk, offset = position.chunk, position.offset
+        if chunk is self._root:
+            chunk = self._root.prev
+            if chunk is self._root or len(chunk.values) >= self.chunk_size:
+                chunk = Chunk()
+                self._link_chunk(chunk, self._root.prev)
+            offset = len(chunk.values)
+        elif len(chunk.values) >= self.chunk_size:
+            self._split(chunk)
+            if offset > len(chunk.values):
+                offset -= len(chunk.values)
+                chunk = chunk.next
+
+        chunk.values.insert(offset, val)
+        for cursor in chunk.live_cursors():
+            if cursor.offset >= offset:
+                cursor.offset += 1
+        self._size += 1
+        return Cursor(self._root, chunk, offset)
+
+    def _erase(self, position: Cursor) -> Cursor:
+        """
+        :param position: cursor to the value to erase
+        :return: cursor to the value that followed it
+        """
+        position._check()
+        chunk, offset = position.chunk, position.offset
+        del chunk.values[offset]
+        for cursor in chunk.live_cursors():
+            if cursor.offset == offset:
+                cursor.chunk = None
+                chunk.untrack(cursor)
+            elif cursor.offset > offset:
+                cursor.offset -= 1
+        self._size -= 1
+
+        if not chunk.values:
+            self._unlink_chunk(chunk)
+            return _cursor(self._root, chunk.next, 0)
+
+        if offset < len(chunk.values):
+            following = Cursor(self._root, chunk, offset)
+        else:
+            following = _cursor(self._root, chunk.next, 0)
+        if len(chunk.values) <= self.chunk_size // 4:
+            if chunk.next is not self._root and \
+                    len(chunk.values) + len(chunk.next.values) <= self.chunk_size:
+                self._merge(chunk, chunk.next)
+            elif chunk.prev is not self._root and \
+                    len(chunk.values) + len(chunk.prev.values) <= self.chunk_size:
+                self._merge(chunk.prev, chunk)
+        return following
+
+    def _split(self, chunk: Chunk) -> None:
+        """
+        Moves the back half of chunk into a new chunk after it
+        :param chunk: full chunk
+        """
+        half = len(chunk.values) // 2
+        new = Chunk(chunk.values[half:])
+        del chunk.values[half:]
+        self._link_chunk(new, chunk)
+        for cursor in chunk.live_cursors():
+            if cursor.offset >= half:
+                chunk.untrack(cursor)
+                cursor.chunk, cursor.offset = new, cursor.offset - half
+                new.track(cursor)
+
+    def _merge(self, chunk: Chunk, following: Chunk) -> None:
+        """
+        Appends the values of following to chunk and unlinks following
+        :param chunk: chunk to keep
+        :param following: chunk right after chunk
+        """
+        shift = len(chunk.values)
+        chunk.values.extend(following.values)
+        for cursor in following.live_cursors():
+            cursor.chunk, cursor.offset = chunk, cursor.offset + shift
+            chunk.track(cursor)
+        self._unlink_chunk(following)
+
+    def _retain(self, keep: Callable[[T], bool]) -> None:
+        """
+        Keeps the values for which keep returns True, called once per value in list order,
+        then merges neighbouring chunks that fit together
+        :param keep: filter function
+        """
+        chunk = self._root.next
+        while chunk is not self._root:
+            values = chunk.values
+            cursors = chunk.live_cursors()
+            if cursors:
+                kept, offsets = [], []
+                for val in values:
+                    if keep(val):
+                        offsets.append(len(kept))
+                        kept.append(val)
+                    else:
+                        offsets.append(None)
+                for cursor in cursors:
+                    cursor.offset = offsets[cursor.offset]
+                    if cursor.offset is None:
+                        cursor.chunk = None
+                        chunk.untrack(cursor)
+            else:
+                kept = [val for val in values if keep(val)]
+            self._size -= len(values) - len(kept)
+            chunk.values = kept
+            if not kept:
+                self._unlink_chunk(chunk)
+            chunk = chunk.next
+
+        chunk = self._root.next
+        while chunk is not self._root and chunk.next is not self._root:
+            if len(chunk.values) + len(chunk.next.values) <= self.chunk_size:
+                self._merge(chunk, chunk.next)
+            else:
+                chunk = chunk.next
@@ -0,0 +1,445 @@
+"""
+PROJECT 1 - Doubly Linked List - Benchmarks
+Times List against collections.deque and the built-in list, against the
+original recursive helpers, and across storage layouts
+Run with: python -m Project1.benchmark --suite containers --output results.json
+"""
+
+import argparse
+import json
+import platform
+import sys
+import timeit
+import tracemalloc
+from collections import deque
+from threading import Lock, Thread
+from itertools import filterfalse, groupby
+from time import perf_counter
+from typing import Callable, Dict, List as PyList
+
+from Project1.List import List, diagnose_playlist, repair_playlist, np
+from Project1.NodePool import PooledList
+from Project1.UnrolledList import UnrolledList
+from Project1.ConcurrentList import ConcurrentList
+
+RECURSIVE_SIZE = 900  # recursive helpers overflow the stack at about 1000 nodes
+DIAGNOSTIC_SIZE = 10_000_000
+CONTAINER_SIZES = [10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6, 10 ** 7]
+OPERATIONS = 1000  # calls timed for each single element operation
+
+
+def recursive_size(lst: List) -> int:
+    """
+    Original recursive size helper, kept as a baseline
+    :param lst: List to measure
+    :return: number of nodes not including the root node
+    """
+
+    def size_list(node) -> int:
+        if node.next is lst.node:
+            return 0
+        return 1 + size_list(node.next)
+
+    return size_list(lst.node)
+
+
+def recursive_str(lst: List) -> str:
+    """
+    Original recursive __str__ helper, kept as a baseline
+    :param lst: List to convert
+    :return: string representation of lst
+    """
+
+    def to_string(node):
+        if node is lst.node:
+            return ""
+        elif node.next is lst.node:
+            return "{}".format(node.val)
+        return "{}".format(node.val) + " <-> " + to_string(node.next)
+
+    return to_string(lst.node.next)
+
+
+def recursive_equal(lst: List, other: List) -> bool:
+    """
+    Original recursive __eq__ helper, kept as a baseline
+    :param lst: first List to compare
+    :param other: second List to compare
+    :return: True if equal otherwise False
+    """
+
+    def is_equal(node1, node2) -> bool:
+        if node1 is lst.node and node2 is other.node:
+            return True
+        if node1 is lst.node or node2 is other.node or node1 != node2 \
+                or node1.prev != node2.prev:
+            return False
+        return is_equal(node1.next, node2.next)
+
+    return is_equal(lst.node.next, other.node.next)
+
+
+def recursive_reverse(lst: List) -> None:
+    """
+    Original recursive reverse helper, kept as a baseline
+    :param lst: List to reverse in place
+    """
+
+    def reverse_list(node) -> None:
+        node.prev, node.next = node.next, node.prev
+        if node is not lst.node:
+            return reverse_list(node.next)
+
+    reverse_list(lst.node.prev)
+
+
+def compare_recursive(size: int = RECURSIVE_SIZE, number: int = 200) -> Dict[str, Dict[str, float]]:
+    """
+    Times each iterative operation against its recursive baseline
+    :param size: number of nodes in the timed lists
+    :param number: repetitions per measurement
+    :return: mapping of operation name to iterative/recursive seconds and speedup
+    """
+    lst = List(container=list(range(size)))
+    other = List(container=list(range(size)))
+    cases = {
+        "size": (lst.size, lambda: recursive_size(lst)),
+        "__str__": (lst.__str__, lambda: recursive_str(lst)),
+        "__eq__": (lambda: lst == other, lambda: recursive_equal(lst, other)),
+        "reverse": (lst.reverse, lambda: recursive_reverse(lst)),
+    }
+    results = {}
+    for name, (iterative, recursive) in cases.items():
+        results[name] = _compare(iterative, recursive, number)
+    return results
+
+
+def _compare(iterative: Callable, recursive: Callable, number: int) -> Dict[str, float]:
+    """
+    :param iterative: new implementation
+    :param recursive: baseline implementation
+    :param number: repetitions per measurement
+    :return: seconds for both implementations and the speedup ratio
+    """
+    iterative_time = min(timeit.repeat(iterative, number=number, repeat=3))
+    recursive_time = min(timeit.repeat(recursive, number=number, repeat=3))
+    return {"iterative": iterative_time, "recursive": recursive_time,
+            "speedup": recursive_time / iterative_time}
+
+
+def large_list(size: int = 2_000_000) -> Dict[str, float]:
+    """
+    Runs each iterative operation once on a list far beyond the recursion limit
+    :param size: number of nodes
+    :return: mapping of operation name to seconds
+    """
+    lst = List(container=range(size))
+    other = List(container=range(size))
+    cases = {
+        "size": lst.size,
+        "__eq__": lambda: lst == other,
+        "reverse": lst.reverse,
+        "unique": lst.unique,
+        "remove_if": lambda: lst.remove_if(lambda x: x % 2 == 0),
+    }
+    return {name: timeit.timeit(case, number=1) for name, case in cases.items()}
+
+
+def pool_vs_objects(size: int = 1_000_000) -> Dict[str, Dict[str, float]]:
+    """
+    Compares memory and throughput of the object-per-node List with the array-backed PooledList
+    and the chunked UnrolledList
+    :param size: number of nodes
+    :return: mapping of storage layout to peak bytes per node and seconds per operation
+    """
+    results = {}
+    for name, cls in (("objects", List), ("pool", PooledList), ("unrolled", UnrolledList)):
+        tracemalloc.start()
+        lst = cls()
+        for i in range(size):
+            lst.push_back(i)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        results[name] = {
+            "bytes_per_node": peak / size,
+            "push_back": timeit.timeit(lambda: cls().assign(container=range(size)), number=1),
+            "__str__": timeit.timeit(lst.__str__, number=1),
+            "__eq__": timeit.timeit(lambda target=lst: target == target, number=1),
+            "reverse": timeit.timeit(lst.reverse, number=1),
+            "remove_if": timeit.timeit(lambda target=lst: target.remove_if(lambda x: x % 2), number=1),
+        }
+        del lst
+    return results
+
+
+def batched_remove_if(sizes: PyList[int] = None) -> PyList[Dict]:
+    """
+    Times remove_if with a scalar predicate against the NumPy batched predicate
+    on lists of floats, removing about half the nodes
+    :param sizes: list lengths, 1e6 and 1e7 when not given
+    :return: one record per size, or a note when NumPy is not installed
+    """
+    if np is None:
+        return [{"skipped": "numpy is not installed"}]
+    records = []
+    for size in sizes or [1_000_000, 10_000_000]:
+        times = {}
+        for mode, pred_vec in (("scalar", None), ("batched", lambda values: values < 0.5)):
+            lst = List(container=np.random.random(size).tolist())
+            start = perf_counter()
+            lst.remove_if(lambda x: x < 0.5, pred_vec)
+            times[mode] = perf_counter() - start
+            del lst
+        records.append({"size": size, **times, "speedup": times["scalar"] / times["batched"]})
+    return records
+
+
+def corrupted_playlist(size: int = DIAGNOSTIC_SIZE) -> Dict[str, float]:
+    """
+    Times diagnosis and repair of a large playlist corrupted in each supported way
+    :param size: number of nodes
+    :return: mapping of scenario to seconds
+    """
+    lst = List.from_iterable(range(size))
+    middle = lst.node
+    for _ in range(size // 2):
+        middle = middle.next
+    results = {"proper": timeit.timeit(lambda: diagnose_playlist(lst), number=1)}
+
+    lst.node.prev.next = None
+    results["broken next"] = timeit.timeit(lambda: repair_playlist(lst, "next"), number=1)
+
+    lst.node.next.prev = None
+    results["broken prev"] = timeit.timeit(lambda: repair_playlist(lst, "prev"), number=1)
+
+    lst.node.prev.next = middle
+    results["improper"] = timeit.timeit(lambda: diagnose_playlist(lst), number=1)
+    return results
+
+
+def _repeat(method: Callable, count: int, *args) -> None:
+    """
+    :param method: bound method to call
+    :param count: number of calls
+    :param args: arguments of every call
+    """
+    for _ in range(count):
+        method(*args)
+
+
+def _is_odd(val: int) -> bool:
+    """:return: True if val is odd"""
+    return val % 2 == 1
+
+
+def _list_insert_middle(lst: List, count: int) -> None:
+    """
+    Finds the middle node once, then inserts before it
+    :param lst: List to insert into
+    :param count: number of insertions
+    """
+    _repeat(lst.insert, count, lst.at(lst.size() // 2), 0)
+
+
+def _deque_remove_if(dq: deque, pred: Callable) -> None:
+    """
+    deque has no in place filter, so rebuild its contents
+    :param dq: deque to filter
+    :param pred: values for which pred is True are removed
+    """
+    kept = deque(filterfalse(pred, dq))
+    dq.clear()
+    dq.extend(kept)
+
+
+def _deque_unique(dq: deque) -> None:
+    """
+    deque has no in place unique, so rebuild its contents
+    :param dq: deque to collapse runs of equal values in
+    """
+    kept = [val for val, _ in groupby(dq)]
+    dq.clear()
+    dq.extend(kept)
+
+
+class _LockedList:
+    """
+    List behind one global lock, the baseline for ConcurrentList
+    """
+
+    def __init__(self) -> None:
+        """
+        Creates the empty List and its lock
+        """
+        self.lst = List()
+        self.lock = Lock()
+
+    def push_back(self, val) -> None:
+        """
+        :param val: value of new Node
+        """
+        with self.lock:
+            self.lst.push_back(val)
+
+    def pop_front(self, block: bool = False):
+        """
+        :param block: spin until a value is available
+        :return: value of the erased Node
+        """
+        while True:
+            with self.lock:
+                if not self.lst.empty():
+                    val = self.lst.front().val
+                    self.lst.pop_front()
+                    return val
+            if not block:
+                raise IndexError("pop from an empty List")
+
+
+def concurrent_throughput(items: int = 200_000, pairs: PyList[int] = None) -> PyList[Dict]:
+    """
+    Producers push_back while as many consumers pop_front, for ConcurrentList and a globally locked List
+    :param items: values produced per producer
+    :param pairs: numbers of producer/consumer pairs, (1, 2, 4, 8) when not given
+    :return: one record per (container, pairs) with elapsed seconds and operations per second
+    """
+    records = []
+    for count in pairs or (1, 2, 4, 8):
+        for name, build in (("ConcurrentList", ConcurrentList), ("locked List", _LockedList)):
+            shared = build()
+
+            def produce():
+                for i in range(items):
+                    shared.push_back(i)
+
+            def consume():
+                for _ in range(items):
+                    shared.pop_front(block=True)
+
+            threads = [Thread(target=produce) for _ in range(count)] + \
+                      [Thread(target=consume) for _ in range(count)]
+            start = perf_counter()
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            seconds = perf_counter() - start
+            records.append({"container": name, "pairs": count, "seconds": seconds,
+                            "operations_per_second": 2 * count * items / seconds})
+    return records
+
+
+SINGLE_ELEMENT = {"push_front", "push_back", "pop_front", "pop_back", "insert"}
+
+# container -> (build from values, operation -> function(container, other, count))
+CONTAINERS = {
+    "List": (List.from_iterable, {
+        "push_front": lambda c, o, k: _repeat(c.push_front, k, 0),
+        "push_back": lambda c, o, k: _repeat(c.push_back, k, 0),
+        "pop_front": lambda c, o, k: _repeat(c.pop_front, k),
+        "pop_back": lambda c, o, k: _repeat(c.pop_back, k),
+        "insert": lambda c, o, k: _list_insert_middle(c, k),
+        "remove_if": lambda c, o, k: c.remove_if(_is_odd),
+        "reverse": lambda c, o, k: c.reverse(),
+        "unique": lambda c, o, k: c.unique(),
+        "__eq__": lambda c, o, k: c == o,
+    }),
+    "deque": (deque, {
+        "push_front": lambda c, o, k: _repeat(c.appendleft, k, 0),
+        "push_back": lambda c, o, k: _repeat(c.append, k, 0),
+        "pop_front": lambda c, o, k: _repeat(c.popleft, k),
+        "pop_back": lambda c, o, k: _repeat(c.pop, k),
+        "insert": lambda c, o, k: _repeat(c.insert, k, len(c) // 2, 0),
+        "remove_if": lambda c, o, k: _deque_remove_if(c, _is_odd),
+        "reverse": lambda c, o, k: c.reverse(),
+        "unique": lambda c, o, k: _deque_unique(c),
+        "__eq__": lambda c, o, k: c == o,
+    }),
+    "list": (list, {
+        "push_front": lambda c, o, k: _repeat(c.insert, k, 0, 0),
+        "push_back": lambda c, o, k: _repeat(c.append, k, 0),
+        "pop_front": lambda c, o, k: _repeat(c.pop, k, 0),
+        "pop_back": lambda c, o, k: _repeat(c.pop, k),
+        "insert": lambda c, o, k: _repeat(c.insert, k, len(c) // 2, 0),
+        "remove_if": lambda c, o, k: c.__setitem__(slice(None), filterfalse(_is_odd, c)),
+        "reverse": lambda c, o, k: c.reverse(),
+        "unique": lambda c, o, k: c.__setitem__(slice(None), [val for val, _ in groupby(c)]),
+        "__eq__": lambda c, o, k: c == o,
+    }),
+}
+
+
+def compare_containers(sizes: PyList[int] = None, operations: int = OPERATIONS,
+                       containers: PyList[str] = None) -> PyList[Dict]:
+    """
+    Times every operation of every container at every size on a fresh container
+    Single element operations are called min(operations, size) times, whole container operations once
+    Values are i // 2 so that unique has work to do; construction is not timed
+    :param sizes: container lengths, CONTAINER_SIZES when not given
+    :param operations: calls per single element operation
+    :param containers: names from CONTAINERS, all when not given
+    :return: one record per (container, operation, size) with the elapsed seconds
+    """
+    records = []
+    for size in sizes or CONTAINER_SIZES:
+        values = [i // 2 for i in range(size)]
+        count = min(operations, size)
+        for name in containers or CONTAINERS:
+            build, cases = CONTAINERS[name]
+            for operation, case in cases.items():
+                container = build(values)
+                other = build(values) if operation == "__eq__" else None
+                start = perf_counter()
+                case(container, other, count)
+                seconds = perf_counter() - start
+                records.append({"container": name, "operation": operation, "size": size,
+                                "calls": count if operation in SINGLE_ELEMENT else 1,
+                                "seconds": seconds})
+                del container, other
+    return records
+
+
+SUITES = {
+    "containers": lambda args: compare_containers(args.sizes, args.operations, args.containers),
+    "recursive": lambda args: compare_recursive(),
+    "large": lambda args: large_list(),
+    "pool": lambda args: pool_vs_objects(),
+    "diagnostics": lambda args: corrupted_playlist(),
+    "remove_if": lambda args: batched_remove_if(args.sizes),
+    "concurrent": lambda args: concurrent_throughput(),
+}
+
+
+def main(argv: PyList[str] = None) -> Dict:
+    """
+    Runs the selected suites and writes one JSON report
+    :param argv: command line arguments, sys.argv when not given
+    :return: the report
+    """
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--suite", nargs="+", choices=sorted(SUITES), default=["containers"])
+    parser.add_argument("--sizes", nargs="+", type=int, default=None,
+                        help="list lengths, each suite has its own default")
+    parser.add_argument("--operations", type=int, default=OPERATIONS)
+    parser.add_argument("--containers", nargs="+", choices=sorted(CONTAINERS), default=None)
+    parser.add_argument("--output", default="-", help="file for the JSON report, - for stdout")
+    args = parser.parse_args(argv)
+
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), RECURSIVE_SIZE * 2 + 100))
+    report = {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "results": {suite: SUITES[suite](args) for suite in args.suite},
+    }
+    if args.output == "-":
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    else:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+    return report
+
+
+if __name__ == '__main__':
+    main()
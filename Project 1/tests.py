@@ -1,7 +1,14 @@
+import gc
+import os
+import tempfile
+import threading
 import unittest
 
 from random import randint, seed
-from Project1.List import List, fix_playlist
+from Project1.List import List, fix_playlist, diagnose_playlist, repair_playlist, np
+from Project1.NodePool import PooledList
+from Project1.UnrolledList import UnrolledList
+from Project1.ConcurrentList import ConcurrentList
 
 seed(331)  # change this or comment for more testing
 
@@ -90,6 +97,46 @@ class TestProject1(unittest.TestCase):
         lst.assign(container=[1 for i in range(200)])
         assert lst.size() == 200
 
+    def test_cached_size(self):
+        """size is maintained by every mutator"""
+
+        List.debug = True
+        try:
+            lst = List(container=[1, 2, 3, 4, 5])
+            lst.insert(lst.node.next, 0, 3)
+            assert lst.size() == 8
+            lst.erase(lst.node.next)
+            lst.erase(lst.node.next, lst.node.prev)
+            assert lst.size() == 1
+            lst.push_front(5)
+            lst.push_back(5)
+            lst.push_back(2)
+            assert lst.size() == 4
+            lst.pop_front()
+            lst.pop_back()
+            assert lst.size() == 2
+            lst.unique()
+            assert lst.size() == 1
+            lst.pop_back()
+            lst.pop_back()
+            lst.pop_front()
+            assert lst.size() == 0
+
+            lst.assign(4, 1)
+            other = List(container=[1, 2, 3, 4, 5, 6])
+            lst.swap(other)
+            assert lst.size() == 6 and other.size() == 4
+            lst.remove(3)
+            lst.remove_if(lambda x: x > 4)
+            assert lst.size() == 3
+            other.clear()
+            assert other.size() == 0
+
+            lst.node.next.next = lst.node  # unlinked without the list knowing
+            self.assertRaises(RuntimeError, lst.size)
+        finally:
+            List.debug = False
+
     def test_string(self):
         """__str__"""
 
@@ -268,6 +315,580 @@ class TestProject1(unittest.TestCase):
             lst.unique()
             assert lst == List(container=arr[1])
 
+    def test_large(self):
+        """operations on lists longer than the recursion limit"""
+
+        size = 20000
+        arr = [i // 2 % 100 for i in range(size)]
+        lst = List(container=arr)
+        assert lst.size() == size
+        assert str(lst) == " <-> ".join([str(x) for x in arr])
+        assert lst == List(container=arr)
+
+        lst.unique()
+        assert lst.size() == size // 2
+
+        lst.reverse()
+        assert lst.front().val == 99
+        assert lst.back().val == 0
+
+        lst.remove_if(lambda x: x % 2)
+        assert lst.size() == size // 4
+
+        lst.insert(lst.node, 7, size)
+        assert lst.size() == size // 4 + size
+
+    def test_splice_merge_sort(self):
+        """splice, merge, sort"""
+
+        lst, other = List(container=[1, 2, 3]), List(container=[4, 5, 6, 7])
+        lst.splice(lst.node.next.next, other, other.node.next, other.node.prev)
+        assert lst == List(container=[1, 4, 5, 6, 2, 3]) and other == List(container=[7])
+        assert lst.size() == 6 and other.size() == 1
+
+        lst.splice(lst.node, other)
+        assert lst == List(container=[1, 4, 5, 6, 2, 3, 7]) and other.empty()
+        assert lst.size() == 7 and other.size() == 0
+
+        moved = lst.node.next.next
+        lst.splice(lst.node, lst, moved)  # single node within the same list
+        assert lst == List(container=[1, 5, 6, 2, 3, 7, 4]) and lst.size() == 7
+        assert lst.back() is moved
+
+        lst.splice(lst.node.next, other)  # empty other
+        assert lst.size() == 7
+
+        # merge is stable and does not allocate
+        lst = List(container=[(1, "a"), (3, "a"), (5, "a")])
+        other = List(container=[(0, "b"), (3, "b"), (6, "b"), (7, "b")])
+        nodes = {id(lst.node.next), id(other.node.next), id(other.node.prev)}
+        lst.merge(other, key=lambda pair: pair[0])
+        assert lst == List(container=[(0, "b"), (1, "a"), (3, "a"), (3, "b"), (5, "a"), (6, "b"), (7, "b")])
+        assert other.empty() and lst.size() == 7 and other.size() == 0
+        assert nodes == {id(lst.node.next.next), id(lst.node.next), id(lst.node.prev)}
+
+        lst = List()
+        lst.merge(List(container=[1, 2]))
+        assert lst == List(container=[1, 2])
+
+        # sort
+        for n in [0, 1, 2, 3, 10, 257]:
+            arr = [randint(0, 20) for _ in range(n)]
+            lst = List(container=arr)
+            lst.sort()
+            assert lst == List(container=sorted(arr)) and lst.size() == n
+            lst.sort(key=lambda x: -x)
+            assert lst == List(container=sorted(arr, reverse=True))
+            assert lst.node.prev.next is lst.node and lst.node.next.prev is lst.node
+
+        pairs = [(randint(0, 5), i) for i in range(100)]
+        lst = List(container=pairs)
+        lst.sort(key=lambda pair: pair[0])
+        assert lst == List(container=sorted(pairs, key=lambda pair: pair[0]))
+
+    def test_hash_index(self):
+        """contains, remove, dedupe with and without the index"""
+
+        for indexed in (False, True):
+            lst = List(container=[1000, 2000, 1000, 3000, 2000, 1000])
+            if indexed:
+                lst.build_index()
+            assert 1000 in lst and lst.contains(3000) and not lst.contains(4000)
+
+            lst.remove(int("1000"))  # equal but not the same object
+            assert lst == List(container=[2000, 3000, 2000]) and lst.size() == 3
+            assert 1000 not in lst
+
+            lst.push_front(3000)
+            lst.insert(lst.node.next, 5000, 2)
+            lst.dedupe()
+            assert lst == List(container=[5000, 3000, 2000]) and lst.size() == 3
+
+            other = List(container=[7000, 7000])
+            lst.splice(lst.node, other, other.node.next)
+            assert 7000 in lst and 7000 in other
+            lst.merge(other)
+            lst.erase(lst.node.next, lst.node.next.next)
+            assert lst == List(container=[3000, 2000, 7000, 7000])
+            assert 5000 not in lst and 7000 in lst
+
+            lst.swap(other)
+            assert 7000 not in lst and 7000 in other
+            other.assign(container=[8000])
+            assert other.contains(8000) and not other.contains(7000)
+            other.clear()
+            assert 8000 not in other
+
+        lst = List(container=["a", "a", "b", "a", "c", "c"])
+        lst.unique()
+        assert lst == List(container=["a", "b", "a", "c"])
+        lst.build_index()
+        lst.unique()
+        lst.dedupe()
+        assert lst == List(container=["a", "b", "c"])
+        lst.drop_index()
+        assert "b" in lst
+
+    def test_streaming(self):
+        """from_iterable, from_file, to_file"""
+
+        lst = List.from_iterable(i * i for i in range(5))
+        assert lst == List(container=[0, 1, 4, 9, 16]) and lst.size() == 5
+        assert List.from_iterable(iter([])) == List()
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "playlist.txt")
+            lst = List.from_iterable(range(10000))
+            lst.to_file(path, chunk_size=64)
+            assert List.from_file(path, parse=int) == lst
+
+            List(container=["a b", "", "c"]).to_file(path)
+            assert List.from_file(path) == List(container=["a b", "", "c"])
+
+            List().to_file(path)
+            assert List.from_file(path).empty()
+
+    def test_iterators(self):
+        """__iter__, __reversed__, nodes"""
+
+        arr = [randint(0, 100) for _ in range(50)]
+        lst = List(container=arr)
+        assert list(lst) == arr
+        assert list(reversed(lst)) == arr[::-1]
+        assert list(List()) == [] and list(reversed(List())) == []
+
+        first, last = lst.node.next.next, lst.node.prev.prev
+        assert [node.val for node in lst.nodes(first, last)] == arr[1:-2]
+        assert [node.val for node in lst.nodes(last, first, reverse=True)] == arr[-2:1:-1]
+        assert all(node is lst.node.next for node in lst.nodes(last=lst.node.next.next))
+
+        # structural modification while iterating
+        iterator = iter(lst)
+        next(iterator)
+        lst.push_back(1)
+        self.assertRaises(RuntimeError, next, iterator)
+
+        for change in (lst.reverse, lst.sort, lst.clear, lambda: lst.swap(List())):
+            lst.assign(container=arr)
+            iterator = reversed(lst)
+            next(iterator)
+            change()
+            self.assertRaises(RuntimeError, next, iterator)
+
+        # corrupted cycle fails instead of looping forever
+        lst.assign(container=arr)
+        lst.node.prev.next = lst.node.next
+        self.assertRaises(RuntimeError, list, lst)
+        lst.assign(container=arr)
+        lst.node.prev.next = None
+        self.assertRaises(RuntimeError, list, lst)
+
+    def test_diagnostics(self):
+        """diagnose_playlist, repair_playlist"""
+
+        lst = List(container=[1, 2, 3, 4, 5, 6])
+        diagnosis = diagnose_playlist(lst)
+        assert diagnosis.status == "proper" and diagnosis.cycle_length == 7
+        assert diagnosis.cycle_entry is lst.node and diagnosis.break_point is None
+
+        # broken next links
+        last = lst.node.prev
+        last.next = None
+        diagnosis = diagnose_playlist(lst)
+        assert diagnosis.status == "broken" and diagnosis.tail_length == 6
+        assert diagnosis.break_point is last and diagnosis.cycle_entry is None
+        assert diagnose_playlist(lst, "prev").status == "proper"
+        assert repair_playlist(lst)
+        assert lst == List(container=[1, 2, 3, 4, 5, 6]) and list(reversed(lst)) == [6, 5, 4, 3, 2, 1]
+
+        # broken prev links, rebuilt from next links
+        lst.node.next.next.prev = None
+        assert diagnose_playlist(lst, "prev").status == "broken"
+        assert repair_playlist(lst, "next")
+        assert list(reversed(lst)) == [6, 5, 4, 3, 2, 1]
+
+        # next links lost, rebuilt from prev links
+        lst.node.next.next.next = None
+        lst.node.next = None
+        assert diagnose_playlist(lst).status == "broken"
+        assert repair_playlist(lst, "prev")
+        assert list(lst) == [1, 2, 3, 4, 5, 6] and lst.size() == 6
+
+        # improper: the last node wraps to the third
+        third = lst.node.next.next.next
+        lst.node.prev.next = third
+        diagnosis = diagnose_playlist(lst)
+        assert diagnosis.status == "improper" and diagnosis.cycle_entry is third
+        assert diagnosis.tail_length == 3 and diagnosis.cycle_length == 4
+        assert diagnosis.break_point is lst.node.prev
+        assert not repair_playlist(lst) and not fix_playlist(lst)
+        self.assertRaises(ValueError, diagnose_playlist, lst, "sideways")
+
+        # cached size follows the repaired links
+        lst = List(container=[i for i in range(5000)])
+        node = lst.node
+        for _ in range(1000):
+            node = node.next
+        node.next = None
+        assert fix_playlist(lst) and lst.size() == 1000 and lst.back().val == 999
+
+        lst = List()
+        lst.node.next = None
+        assert fix_playlist(lst) and lst.empty() and lst.size() == 0
+
+        # hash index drops the truncated nodes
+        lst = List(container=range(10))
+        lst.build_index()
+        lst.at(4).next = None
+        assert fix_playlist(lst) and 7 not in lst and 4 in lst
+        lst.remove(7)
+        lst.remove(4)
+        assert list(lst) == [0, 1, 2, 3]
+
+        # frozen lists are not relinked
+        lst.freeze()
+        with self.assertRaises(TypeError):
+            fix_playlist(lst)
+
+    def test_batched_remove_if(self):
+        """remove_if with a vectorized predicate matches the scalar predicate"""
+
+        arr = [randint(0, 20) for _ in range(1000)]
+        expected = [x for x in arr if x % 3]
+        lst = List(container=arr)
+        lst.remove_if(lambda x: x % 3 == 0, lambda values: values % 3 == 0, chunk_size=64)
+        assert list(lst) == expected and lst.size() == len(expected)
+
+        # object payloads use the scalar predicate
+        words = List(container=["a", None, "bb", "a"])
+        words.remove_if(lambda x: x == "a", lambda values: values == "a")
+        assert list(words) == [None, "bb"]
+
+    @unittest.skipUnless(np is not None, "numpy is not installed")
+    def test_batched_remove_if_numpy(self):
+        """remove_if calls the vectorized predicate once per chunk"""
+
+        calls = []
+
+        def pred_vec(values):
+            calls.append(len(values))
+            return values >= 50
+
+        lst = List(container=range(100))
+        lst.build_index()
+        lst.remove_if(lambda x: 1 / 0, pred_vec, chunk_size=30)
+        assert calls == [30, 30, 30, 10]
+        assert list(lst) == list(range(50)) and lst.size() == 50
+        assert 60 not in lst and 10 in lst
+
+        # without an index or snapshot the survivors are relinked in place
+        expected = [x for x in range(100) if x % 3]
+        lst = List(container=range(100))
+        lst.remove_if(lambda x: 1 / 0, lambda values: values % 3 == 0, chunk_size=7)
+        assert list(lst) == expected and list(reversed(lst)) == expected[::-1] and lst.size() == len(expected)
+        view = lst.snapshot()
+        lst.remove_if(lambda x: 1 / 0, lambda values: values >= 50, chunk_size=7)
+        assert list(view) == expected and list(lst) == [x for x in expected if x < 50]
+
+        # ragged and nested payloads use the scalar predicate
+        ragged = List(container=[[1, 2], [3], [], [4, [5]]])
+        ragged.remove_if(lambda x: len(x) == 1, lambda values: 1 / 0)
+        assert list(ragged) == [[1, 2], [], [4, [5]]]
+
+    def test_fingerprint(self):
+        """fingerprint, freeze, __hash__"""
+
+        lst, other = List(container=range(100)), List(container=range(100))
+        assert lst.fingerprint() == other.fingerprint() and lst == other
+
+        # pushes and pops at the ends keep the fingerprint current
+        for target in (lst, other):
+            target.pop_front()
+            target.push_front(-1)
+            target.pop_back()
+            target.push_back(100)
+        assert lst._fingerprint_version == lst._version
+        assert lst.fingerprint() == List(container=[-1] + list(range(1, 99)) + [100]).fingerprint()
+        assert lst == other
+
+        # unfrozen lists are walked even with current fingerprints
+        other.pop_back()
+        other.push_back(101)
+        other.node.next.next.val = 100  # not tracked by the fingerprint
+        assert lst != other
+        assert List(container=[1, 2]).fingerprint() != List(container=[2, 1]).fingerprint()
+        first, second = List(container=[1, 2]), List(container=[1, 3])
+        first.fingerprint()
+        second.fingerprint()
+        second.back().val = 2
+        assert first == second
+
+        # fall back to the full comparison when a fingerprint is stale
+        lst.reverse()
+        assert lst._fingerprint_version != lst._version
+        assert lst == List(container=[100] + list(range(98, 0, -1)) + [-1])
+
+        with self.assertRaises(TypeError):
+            hash(lst)
+        lst.freeze()
+        copy = List(container=list(lst))
+        copy.freeze()
+        assert lst.frozen() and hash(lst) == hash(copy) == lst.fingerprint()
+        assert {lst: 1}[lst] == 1
+        for mutate in (lambda: lst.push_back(1), lambda: lst.pop_front(), lambda: lst.clear(),
+                       lambda: lst.reverse(), lambda: lst.sort(), lambda: lst.remove(1)):
+            with self.assertRaises(TypeError):
+                mutate()
+        assert lst.size() == 100
+
+        unhashable = List(container=[[1], [2]])
+        with self.assertRaises(TypeError):
+            unhashable.freeze()
+        assert unhashable == List(container=[[1], [2]])
+
+    def test_positional_access(self):
+        """at, index_of, insert_at, erase_at with and without the skip index"""
+
+        for indexed in (False, True):
+            arr = [randint(0, 100) for _ in range(200)]
+            lst = List(container=arr)
+            if indexed:
+                lst.build_skip_index()
+
+            for _ in range(300):
+                i = randint(0, len(arr))
+                if randint(0, 2) and arr and i < len(arr):
+                    assert lst.erase_at(i) is (lst.node if i == len(arr) - 1 else lst.at(i))
+                    arr.pop(i)
+                else:
+                    assert lst.index_of(lst.insert_at(i, i)) == i
+                    arr.insert(i, i)
+            lst.push_front(-1)
+            lst.push_back(-2)
+            lst.pop_back()
+            lst.remove_if(lambda x: x == 50)
+            lst.erase(lst.at(3), lst.at(10))
+            arr = [-1] + [x for x in arr if x != 50]
+            del arr[3:10]
+
+            assert list(lst) == arr and lst.size() == len(arr)
+            assert [lst.at(i).val for i in range(len(arr))] == arr
+            assert all(lst.index_of(node) == i for i, node in enumerate(lst.nodes()))
+
+            lst.reverse()
+            lst.splice(lst.node, List(container=[7, 8]))
+            assert [lst.at(i).val for i in range(lst.size())] == arr[::-1] + [7, 8]
+            lst.sort()
+            assert [lst.at(i).val for i in range(lst.size())] == sorted(arr + [7, 8])
+
+            self.assertRaises(IndexError, lst.at, lst.size())
+            self.assertRaises(IndexError, lst.insert_at, lst.size() + 1, 0)
+            self.assertRaises(ValueError, lst.index_of, List(container=[1]).node.next)
+            lst.clear()
+            assert lst.insert_at(0, 5) is lst.at(0)
+
+    def test_snapshot(self):
+        """snapshot"""
+
+        arr = [randint(0, 100) for _ in range(1000)]
+        lst = List(container=arr)
+        first = lst.snapshot()
+        assert list(first) == arr and len(first) == 1000 and first == lst
+
+        lst.push_back(1)
+        lst.push_front(2)
+        lst.pop_back()
+        lst.erase(lst.at(10))
+        lst.insert(lst.at(500), 3, 2)
+        assert len(lst._history.records) < 20  # proportional to the edits, not the list
+        second = lst.snapshot()
+        expected = [2] + arr[:9] + arr[10:500] + [3, 3] + arr[500:]
+        assert list(second) == expected and second == lst
+
+        lst.reverse()
+        lst.sort()
+        lst.remove_if(lambda x: x % 3 == 0)
+        lst.splice(lst.node, List(container=[5, 6]))
+        lst.merge(List(container=[0, 200]))
+        lst.erase(lst.at(3), lst.at(20))
+        lst.unique()
+        lst.dedupe()
+        third, third_values = lst.snapshot(), list(lst)
+
+        other = List(container=[7, 8, 9])
+        lst.splice(lst.node.next, other, other.node.next)
+        lst.swap(other)
+        lst.push_back(10)
+        other.clear()
+        other.assign(container=[11])
+
+        assert list(first) == arr and list(reversed(first)) == arr[::-1]
+        assert list(second) == expected and list(reversed(second)) == expected[::-1]
+        assert list(third) == third_values and str(third) == str(List(container=third_values))
+        assert first.to_list() == List(container=arr)
+        assert lst.snapshot() == List(container=[8, 9, 10])
+        assert lst.snapshot() != first
+
+        # nodes spliced out are still read through the history of the list they left
+        for whole in (False, True):
+            source = List(container=range(10))
+            view = source.snapshot()
+            target = List()
+            if whole:
+                target.splice(target.node, source)
+            else:
+                target.splice(target.node, source, source.at(2), source.at(8))
+            target.reverse()
+            target.sort()
+            assert list(view) == list(range(10)) and list(reversed(view)) == list(range(10))[::-1]
+
+        # records are dropped once no snapshot can read them
+        del first, second, third
+        gc.collect()
+        assert not other._history.records and not lst._history.records
+
+    def test_concurrent_list(self):
+        """ConcurrentList"""
+
+        lst = ConcurrentList([1, 2, 3])
+        lst.push_front(0)
+        lst.push_back(4)
+        assert lst.snapshot() == List(container=[0, 1, 2, 3, 4]) and lst.size() == 5
+        assert lst.pop_front() == 0 and lst.pop_back() == 4
+        assert str(lst) == "1 <-> 2 <-> 3"
+        lst.clear()
+        assert lst.empty()
+        self.assertRaises(IndexError, lst.pop_front)
+        self.assertRaises(IndexError, lst.pop_back, True, 0.01)
+
+        # producers at the back, consumers at both ends
+        count, producers = 5000, 4
+        consumed = []
+
+        def produce(start):
+            for i in range(start, start + count):
+                lst.push_back(i)
+
+        def consume(front):
+            while True:
+                val = lst.pop_front(block=True) if front else lst.pop_back(block=True)
+                if val is None:
+                    return
+                consumed.append(val)
+
+        threads = [threading.Thread(target=produce, args=(i * count,)) for i in range(producers)]
+        threads += [threading.Thread(target=consume, args=(i % 2 == 0,)) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads[:producers]:
+            thread.join()
+        for _ in range(4):
+            lst.push_front(None)
+        for thread in threads[producers:]:
+            thread.join(10)
+        assert sorted(consumed) == list(range(count * producers))
+        assert lst.empty() and lst.node.next is lst.node and lst.node.prev is lst.node
+
+        # blocking pop wakes up when another thread pushes
+        timer = threading.Timer(0.05, lst.push_front, ("late",))
+        timer.start()
+        assert lst.pop_back(block=True, timeout=5) == "late"
+
+    def test_pooled_list(self):
+        """PooledList mirrors List"""
+
+        arr = [randint(0, 5) for _ in range(300)]
+        lst, pooled = List(container=arr), PooledList(container=arr, capacity=4)
+        assert pooled == lst and pooled.size() == lst.size() == 300
+        assert str(pooled) == str(lst)
+        assert pooled.front() == arr[0] and pooled.back() == arr[-1]
+
+        for target in (lst, pooled):
+            target.insert(target.node.next.next, 9, 3)
+            target.erase(target.node.next)
+            target.erase(target.node.next.next, target.node.next.next.next.next)
+            target.push_front(7)
+            target.push_back(8)
+            target.pop_front()
+            target.pop_back()
+            target.remove(3)
+            target.remove_if(lambda x: x == 1)
+            target.unique()
+            target.reverse()
+        assert pooled == lst and pooled.size() == lst.size()
+        pooled.check_size()
+
+        # the root is reached through one handle, as in List
+        for target in (lst, pooled):
+            assert target.back().next is target.node and target.front().prev is target.node
+            assert target.erase(target.back()) is target.node
+
+        # erased slots are reused
+        capacity = pooled.pool.capacity()
+        pooled.erase(pooled.node.next, pooled.node)
+        assert pooled.empty() and pooled.front() is pooled.node
+        pooled.assign(container=arr)
+        assert pooled.pool.capacity() == capacity
+
+        other = PooledList(2, "a")
+        pooled.swap(other)
+        assert pooled == PooledList(container=["a", "a"]) and pooled.back().next is pooled.node
+        assert other == List(container=arr)
+        pooled.clear()
+        pooled.pop_back()
+        assert pooled == List() and pooled.size() == 0
+
+    def test_unrolled_list(self):
+        """UnrolledList mirrors List, cursors survive splits and merges"""
+
+        arr = [randint(0, 5) for _ in range(300)]
+        lst, unrolled = List(container=arr), UnrolledList(container=arr, chunk_size=8)
+        assert unrolled == lst and unrolled.size() == lst.size() == 300
+        assert unrolled == PooledList(container=arr) and unrolled == UnrolledList(container=arr, chunk_size=5)
+        assert unrolled != PooledList(container=arr[:-1] + [6]) and unrolled != PooledList(container=arr[1:])
+        assert str(unrolled) == str(lst)
+        assert list(reversed(unrolled)) == arr[::-1]
+
+        for target in (lst, unrolled):
+            target.insert(target.node.next.next, 9, 3)
+            target.erase(target.node.next)
+            target.erase(target.node.next.next, target.node.next.next.next.next)
+            target.push_front(7)
+            target.push_back(8)
+            target.pop_front()
+            target.pop_back()
+            target.remove(3)
+            target.remove_if(lambda x: x == 1)
+            target.unique()
+            target.reverse()
+        assert unrolled == lst and unrolled.size() == lst.size()
+        unrolled.check_size()
+
+        # a cursor keeps pointing at its value while its chunk splits and merges
+        unrolled = UnrolledList(container=range(20), chunk_size=4)
+        tenth = unrolled.front()
+        for _ in range(10):
+            tenth = tenth.next
+        for _ in range(30):
+            unrolled.insert(unrolled.front().next, -1)
+        assert tenth.val == 10
+        unrolled.remove(-1)
+        assert tenth.val == 10 and list(unrolled) == list(range(20))
+        assert unrolled.erase(tenth).val == 11
+        with self.assertRaises(ValueError):
+            tenth.val
+        unrolled.reverse()
+        assert unrolled.front().val == 19 and unrolled.back().val == 0
+
+        unrolled.erase(unrolled.node.next, unrolled.node)
+        assert unrolled.empty() and unrolled.front() is unrolled.node
+        other = UnrolledList(2, "a")
+        unrolled.swap(other)
+        assert unrolled == List(container=["a", "a"]) and other.empty()
+        unrolled.clear()
+        unrolled.pop_back()
+        assert unrolled == List() and unrolled.size() == 0
+
     def test_application(self):
         """fix_playlist"""
 
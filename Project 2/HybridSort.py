@@ -4,48 +4,744 @@ Project 2 - Hybrid Sorting - Starter Code
 CSE 331 Fall 2020
 Professor Sebnem Onsay
 """
-from typing import List, Any, Dict
+import json
+import os
+import pickle
+import platform
+import sys
+from bisect import bisect_left, bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from heapq import heapify, heappop, heappush, heapreplace, merge as heap_merge
+from itertools import repeat
+from operator import itemgetter
+from random import Random
+from tempfile import TemporaryFile
+from time import perf_counter
+from typing import List, Any, Dict, Callable, Iterable, Iterator, BinaryIO, Tuple
 
+try:
+    import numpy as np
+except ImportError:  # ndarray input is only possible with numpy installed
+    np = None
 
-def hybrid_sort(data: List[Any], threshold: int) -> None:
+PROFILE_ENV = "HYBRID_SORT_PROFILE"  # environment variable overriding the profile path
+DEFAULT_PROFILE = os.path.join(os.path.expanduser("~"), ".cache", "hybrid_sort_profile.json")
+TUNING_SAMPLE = 4096  # entries of the data sorted by the tuner
+TUNING_MINIMUM = 256  # fewer entries than this are too few to time, DEFAULT_THRESHOLD is used instead
+DEFAULT_THRESHOLD = 16  # threshold for types not tuned yet
+TUNING_CANDIDATES = (0, 2, 4, 8, 12, 16, 24, 32, 48, 64)
+MEMORY_BUDGET = 64 * 1024 * 1024  # default bytes of entries held in memory by external_sort
+FAN_IN = 16  # default number of runs merged at once by external_sort
+SPILL_BLOCK = 1024  # records pickled together when spilling a run
+PARALLEL_CANDIDATES = 5000  # candidates at which MatchIndex.batch uses a process pool by default
+
+_profile = None  # profile loaded from disk, key -> threshold
+
+
+def hybrid_sort(data: List[Any], threshold: int = None, natural: bool = False, binary: bool = False) -> None:
     """
     Sorts the data using a combination of merge sort algorithm
     and insertion sort algorithm
     :param data: list of entries to be sorted
+    :param threshold: size of the data at which insertion sort should be called,
+    tuned_threshold(data) when not given
+    :param natural: use the bottom-up natural_merge_sort, fast on nearly sorted data
+    :param binary: use binary_insertion_sort below threshold; natural always does
+    """
+    if _is_array(data):
+        data.sort(kind="stable")
+        return
+    if threshold is None:
+        threshold = tuned_threshold(data, binary)
+    if natural:
+        natural_merge_sort(data, threshold)
+    else:
+        merge_sort(data, threshold, binary)
+
+
+def parallel_hybrid_sort(data: List[Any], threshold: int = None, workers: int = None) -> None:
+    """
+    Sorts the data by splitting it into one contiguous run per worker process,
+    sorting every run with hybrid_sort and k-way merging the sorted runs back into data
+    The sort is stable: runs keep the input order and ties are taken from the earlier run
+    :param data: list of picklable entries to be sorted
+    :param threshold: size of the data at which insertion sort should be called, applied to every run,
+    tuned_threshold(data) when not given; ignored for arrays, which NumPy sorts in place
+    :param workers: number of worker processes, os.cpu_count() when not given
+    """
+    if _is_array(data):
+        hybrid_sort(data)
+        return
+    workers = workers or os.cpu_count() or 1
+    if workers < 2 or len(data) < 2 * workers:
+        hybrid_sort(data, threshold)
+        return
+    if threshold is None:
+        threshold = tuned_threshold(data)
+
+    size = -(-len(data) // workers)  # ceiling division
+    runs = [data[i:i + size] for i in range(0, len(data), size)]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        runs = list(executor.map(_sort_run, runs, [threshold] * len(runs)))
+    data[:] = merge_iter(*runs)
+
+
+def _sort_run(run: List[Any], threshold: int) -> List[Any]:
+    """
+    Worker task of parallel_hybrid_sort
+    :param run: part of the data
     :param threshold: size of the data at which insertion sort should be called
+    :return : run sorted with hybrid_sort
+    """
+    hybrid_sort(run, threshold)
+    return run
+
+
+def merge_iter(*iterables: Iterable[Any], key: Callable[[Any], Any] = None) -> Iterator[Any]:
+    """
+    Lazily merges any number of sorted iterables into one sorted stream, like merge does
+    for two lists, holding only the current head of every iterable
+    The merge is stable: entries with equal keys come out in the order of their iterables,
+    and only < is used to compare keys
+    :param iterables: iterables, each sorted by key
+    :param key: function computing the comparison key of an entry, the entry itself when not given
+    :return : generator over the merged entries
+    """
+    heap = []
+    for index, iterable in enumerate(iterables):
+        iterator = iter(iterable)
+        for value in iterator:
+            heap.append(_MergeHead(key(value) if key else value, index, value, iterator))
+            break
+    heapify(heap)
+    while len(heap) > 1:
+        head = heap[0]
+        yield head.value
+        for value in head.iterator:
+            head.key, head.value = key(value) if key else value, value
+            heapreplace(heap, head)
+            break
+        else:
+            heappop(heap)
+    if heap:
+        yield heap[0].value
+        yield from heap[0].iterator
+
+
+class _MergeHead:
+    """
+    Current entry of one iterable in merge_iter, ordered by key and then by iterable
+    """
+
+    __slots__ = ("key", "index", "value", "iterator")
+
+    def __init__(self, key: Any, index: int, value: Any, iterator: Iterator[Any]) -> None:
+        """
+        :param key: key of value
+        :param index: position of the iterable among the merged iterables
+        :param value: current entry
+        :param iterator: remaining entries of the iterable
+        """
+        self.key, self.index, self.value, self.iterator = key, index, value, iterator
+
+    def __lt__(self, other: "_MergeHead") -> bool:
+        """
+        :param other: head of another iterable
+        :return : True if self comes out of the merge before other else False
+        """
+        return self.key < other.key or (not other.key < self.key and self.index < other.index)
+
+
+def merge_join(left: Iterable[Any], right: Iterable[Any], key: Callable[[Any], Any] = None,
+               right_key: Callable[[Any], Any] = None, how: str = "inner") -> Iterator[tuple]:
+    """
+    Joins two streams sorted by key in one pass, buffering only the right entries of the current key
+    Yields (left entry, right entry) for every pair with equal keys, in the order of the streams;
+    with how="left", left entries without a match are yielded as (left entry, None)
+    :param left: entries sorted by key
+    :param right: entries sorted by right_key
+    :param key: key function of the left entries, the entry itself when not given
+    :param right_key: key function of the right entries, key when not given
+    :param how: "inner" or "left"
+    :raises ValueError: if how is neither "inner" nor "left"
+    :return : generator over the joined pairs
+    """
+    if how not in ("inner", "left"):
+        raise ValueError("how must be 'inner' or 'left', not {!r}".format(how))
+    key = key or (lambda entry: entry)
+    right_key = right_key or key
+    end = object()
+    right = iter(right)
+    current = next(right, end)
+    group, group_key = [], end
+    for entry in left:
+        entry_key = key(entry)
+        if not group or group_key < entry_key or entry_key < group_key:
+            while current is not end and right_key(current) < entry_key:
+                current = next(right, end)
+            group, group_key = [], entry_key
+            while current is not end and not entry_key < right_key(current):
+                group.append(current)
+                current = next(right, end)
+        if group:
+            for match in group:
+                yield entry, match
+        elif how == "left":
+            yield entry, None
+
+
+def external_sort(items: Iterable[Any], key: Callable[[Any], Any] = None, memory_budget: int = MEMORY_BUDGET,
+                  fan_in: int = FAN_IN, threshold: int = None, temp_dir: str = None) -> Iterator[Any]:
+    """
+    Sorts a stream of entries too large for memory, yielding them in sorted order
+    Reads chunks of entries whose estimated size stays within memory_budget, sorts every chunk with
+    hybrid_sort and spills it as a run of pickled blocks to a temporary file, then merges the runs
+    with a heap, fan_in runs at a time, in as many passes as needed
+    The sort is stable: every entry is sorted as (key, sequence number) and never compared itself
+    :param items: picklable entries in any order, e.g. the lines of an open file
+    :param key: function computing the comparison key of an entry, the entry itself when not given
+    :param memory_budget: approximate number of bytes held in memory while reading, estimated with
+    sys.getsizeof of every entry, its key, sequence number and record tuple; objects they refer to are not counted
+    :param fan_in: most runs merged at once, at least 2
+    :param threshold: threshold passed to hybrid_sort for every chunk, tuned on the keys of the first chunk
+    when not given
+    :param temp_dir: directory of the temporary files, the system default when not given
+    :return : generator over the sorted entries
+    """
+    fan_in = max(fan_in, 2)
+    entry = itemgetter(-1) if key else itemgetter(0)
+    runs = []
+    chunk, used = [], 0
+    try:
+        for sequence, item in enumerate(items):
+            record = (key(item), sequence, item) if key else (item, sequence)
+            chunk.append(record)
+            used += sys.getsizeof(record) + sys.getsizeof(sequence) + sys.getsizeof(item) + 8  # list slot
+            if key:
+                used += sys.getsizeof(record[0])
+            if used >= memory_budget:
+                threshold = _sort_chunk(chunk, threshold)
+                runs.append(_spill(chunk, temp_dir))
+                chunk, used = [], 0
+        _sort_chunk(chunk, threshold)
+        if not runs:
+            for record in chunk:
+                yield entry(record)
+            return
+        if chunk:
+            runs.append(_spill(chunk, temp_dir))
+        del chunk
+
+        while len(runs) > fan_in:
+            merged = []
+            for start in range(0, len(runs), fan_in):
+                group = runs[start:start + fan_in]
+                merged.append(_spill(heap_merge(*map(_read_run, group)), temp_dir))
+                for run in group:
+                    run.close()
+            runs = merged
+        for record in heap_merge(*map(_read_run, runs)):
+            yield entry(record)
+    finally:
+        for run in runs:
+            run.close()
+
+
+def _sort_chunk(chunk: List[tuple], threshold: int = None) -> int:
+    """
+    Sorts the records of a chunk of external_sort with hybrid_sort
+    :param chunk: records whose first field is the key
+    :param threshold: threshold for hybrid_sort, tuned on the keys rather than the records when not given
+    :return : the threshold used
+    """
+    if threshold is None:
+        threshold = tuned_threshold([record[0] for record in chunk])
+    hybrid_sort(chunk, threshold)
+    return threshold
+
+
+def _spill(records: Iterable[tuple], temp_dir: str = None) -> BinaryIO:
+    """
+    Writes sorted records to a temporary file in pickled blocks of SPILL_BLOCK records
+    :param records: sorted records
+    :param temp_dir: directory of the temporary file
+    :return : the file, deleted once closed
     """
-    merge_sort(data, threshold)
+    run = TemporaryFile(dir=temp_dir)
+    block = []
+    for record in records:
+        block.append(record)
+        if len(block) == SPILL_BLOCK:
+            pickle.dump(block, run, pickle.HIGHEST_PROTOCOL)
+            block = []
+    if block:
+        pickle.dump(block, run, pickle.HIGHEST_PROTOCOL)
+    return run
+
+
+def _read_run(run: BinaryIO) -> Iterator[tuple]:
+    """
+    :param run: file written by _spill
+    :return : generator over its records
+    """
+    run.seek(0)
+    while True:
+        try:
+            block = pickle.load(run)
+        except EOFError:
+            return
+        yield from block
+
+
+def tuned_threshold(data: List[Any], binary: bool = False) -> int:
+    """
+    Returns the threshold measured fastest for the type of the entries of data on this machine
+    Tunes on a sample of data the first time a type is seen and stores the result in a JSON profile,
+    at the path in the HYBRID_SORT_PROFILE environment variable or DEFAULT_PROFILE
+    An untuned type gets DEFAULT_THRESHOLD, without tuning or storing, while data is shorter than TUNING_MINIMUM
+    :param data: list of entries about to be sorted
+    :param binary: tune the binary_insertion_sort path instead of insertion_sort
+    :return : threshold for hybrid_sort
+    """
+    global _profile
+    if len(data) < 2:
+        return 0
+    entry_type = type(data[0])
+    key = "{}.{}|{}|{}|{}|{}".format(entry_type.__module__, entry_type.__qualname__,
+                                     "binary" if binary else "linear", platform.node(),
+                                     platform.machine(), platform.python_implementation())
+    path = os.environ.get(PROFILE_ENV, DEFAULT_PROFILE)
+    if _profile is None or _profile[0] != path:
+        _profile = (path, _load_profile(path))
+    profile = _profile[1]
+    if key not in profile:
+        if len(data) < TUNING_MINIMUM:
+            return DEFAULT_THRESHOLD
+        step = max(1, len(data) // TUNING_SAMPLE)
+        profile[key] = tune_threshold(data[::step][:TUNING_SAMPLE], binary)
+        _save_profile(path, profile)
+    return profile[key]
+
+
+def tune_threshold(sample: List[Any], binary: bool = False, candidates: tuple = TUNING_CANDIDATES,
+                   repeat: int = 3) -> int:
+    """
+    Micro-benchmarks merge_sort on a shuffled copy of sample with every candidate threshold
+    :param sample: entries of the type to tune for
+    :param binary: time the binary_insertion_sort path instead of insertion_sort
+    :param candidates: thresholds to try
+    :param repeat: timings per candidate, the fastest is kept
+    :return : the candidate with the fastest sort
+    """
+    sample = sample[:]
+    Random(len(sample)).shuffle(sample)
+    best, best_time = candidates[0], float("inf")
+    for threshold in candidates:
+        seconds = float("inf")
+        for _ in range(repeat):
+            copy = sample[:]
+            start = perf_counter()
+            merge_sort(copy, threshold, binary)
+            seconds = min(seconds, perf_counter() - start)
+        if seconds < best_time:
+            best, best_time = threshold, seconds
+    return best
+
+
+def _load_profile(path: str) -> Dict[str, int]:
+    """
+    :param path: JSON profile file
+    :return : the stored thresholds, empty when the file is missing or unreadable
+    """
+    try:
+        with open(path) as file:
+            profile = json.load(file)
+    except (OSError, ValueError):
+        return {}
+    return profile if isinstance(profile, dict) else {}
+
+
+def _save_profile(path: str, profile: Dict[str, int]) -> None:
+    """
+    Writes the profile, ignoring failures so that sorting never depends on a writable disk
+    :param path: JSON profile file
+    :param profile: thresholds to store
+    """
+    try:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w") as file:
+            json.dump(profile, file, indent=2, sort_keys=True)
+    except OSError:
+        pass
 
 
 def inversions_count(data: List[Any]) -> int:
     """
     Returns the number of inversions done to sort the given list
-    by using the function merge_sort
+    by using a Fenwick tree over the ranks of the entries; data is not modified
     :param data: list of entries to be sorted
     :return : the number of inversions done to sort the list
     """
-    return merge_sort(data)
+    if _is_array(data):
+        return array_inversions_count(data)
+    return sum(inversion_profile(data))
+
+
+def inversion_profile(data: List[Any]) -> List[int]:
+    """
+    Returns the contribution of every entry to the inversions of data:
+    the number of earlier entries greater than it; data is not modified
+    :param data: list of comparable entries
+    :return : contributions in the order of data, summing to inversions_count(data)
+    """
+    universe = sorted(data)
+    tree = [0] * (len(data) + 1)
+    profile = []
+    for seen, entry in enumerate(data):
+        rank = bisect_left(universe, entry) + 1
+        profile.append(seen - _fenwick_prefix(tree, rank))
+        _fenwick_add(tree, rank, 1)
+    return profile
+
+
+def _fenwick_add(tree: List[int], index: int, delta: int) -> None:
+    """
+    :param tree: Fenwick tree, tree[0] unused
+    :param index: 1 based position to add to
+    :param delta: amount to add
+    """
+    while index < len(tree):
+        tree[index] += delta
+        index += index & -index
+
+
+def _fenwick_prefix(tree: List[int], index: int) -> int:
+    """
+    :param tree: Fenwick tree, tree[0] unused
+    :param index: 1 based position
+    :return : sum of the positions 1 to index
+    """
+    total = 0
+    while index > 0:
+        total += tree[index]
+        index -= index & -index
+    return total
+
+
+class InversionCounter:
+    """
+    Inversion count and per-entry profile of a sequence that grows at the end or changes in place
+    Keeps a Fenwick tree counting the entries of every rank of a sorted universe of values,
+    and a sorted list of the entries whose values are outside it. The universe is rebuilt with them
+    once they outnumber it, so it at least doubles every rebuild: appending takes O(log n) amortized,
+    and changing an entry takes O(n) to update the profile of the later entries
+    """
+
+    def __init__(self, data: Iterable[Any] = (), universe: Iterable[Any] = None) -> None:
+        """
+        :param data: initial entries
+        :param universe: values expected to be appended, the values of data when not given
+        """
+        self._data = []
+        self._profile = []
+        self._total = 0
+        self._universe = []
+        self._pending = []  # sorted entries whose values are not in the universe
+        self._tree = [0]
+        values = list(data)
+        self._rebuild(list(universe or ()) + values)
+        for value in values:
+            self.append(value)
+
+    def __len__(self) -> int:
+        """
+        :return : number of entries
+        """
+        return len(self._data)
+
+    def inversions(self) -> int:
+        """
+        :return : the number of inversions of the entries
+        """
+        return self._total
 
-def merge_sort(data: List[Any], threshold: int = 0) -> int:
+    def profile(self) -> List[int]:
+        """
+        :return : for every entry, the number of earlier entries greater than it
+        """
+        return self._profile[:]
+
+    def append(self, value: Any) -> int:
+        """
+        Adds value after the last entry
+        :param value: entry to add
+        :return : the number of earlier entries greater than value
+        """
+        counted = len(self._data) - len(self._pending)
+        contribution = counted - _fenwick_prefix(self._tree, bisect_right(self._universe, value)) \
+            + len(self._pending) - bisect_right(self._pending, value)
+        self._add(value)
+        self._data.append(value)
+        self._profile.append(contribution)
+        self._total += contribution
+        if len(self._pending) > len(self._universe):
+            self._rebuild(self._universe + self._pending)
+        return contribution
+
+    def change(self, index: int, value: Any) -> None:
+        """
+        Replaces the entry at index with value
+        :param index: position of the entry, negative counting from the end
+        :param value: new entry
+        """
+        index = range(len(self._data))[index]
+        old = self._data[index]
+        self._discard(old)
+        self._add(value)
+        self._data[index] = value
+
+        contribution = 0
+        for earlier in self._data[:index]:
+            if value < earlier:
+                contribution += 1
+        self._total += contribution - self._profile[index]
+        self._profile[index] = contribution
+        for later in range(index + 1, len(self._data)):
+            entry = self._data[later]
+            delta = (entry < value) - (entry < old)
+            self._profile[later] += delta
+            self._total += delta
+
+    def _rank(self, value: Any) -> int:
+        """
+        :param value: entry
+        :return : 1 based rank of value in the universe, 0 when it is not in the universe
+        """
+        position = bisect_left(self._universe, value)
+        if position < len(self._universe) and not value < self._universe[position]:
+            return position + 1
+        return 0
+
+    def _add(self, value: Any) -> None:
+        """
+        Counts one more entry of value, in the tree or the pending entries
+        :param value: entry
+        """
+        rank = self._rank(value)
+        if rank:
+            _fenwick_add(self._tree, rank, 1)
+        else:
+            self._pending.insert(bisect_right(self._pending, value), value)
+
+    def _discard(self, value: Any) -> None:
+        """
+        Counts one less entry of value, in the tree or the pending entries
+        :param value: entry counted before
+        """
+        rank = self._rank(value)
+        if rank:
+            _fenwick_add(self._tree, rank, -1)
+        else:
+            del self._pending[bisect_left(self._pending, value)]
+
+    def _rebuild(self, values: List[Any]) -> None:
+        """
+        Replaces the universe with the distinct values given and recounts the entries in a new tree
+        :param values: values of the new universe, with duplicates, including every pending entry
+        """
+        values = sorted(values)
+        self._universe = [value for i, value in enumerate(values) if i == 0 or values[i - 1] < value]
+        self._pending = []
+        self._tree = [0] * (len(self._universe) + 1)
+        for entry in self._data:
+            _fenwick_add(self._tree, bisect_left(self._universe, entry) + 1, 1)
+
+
+def merge_sort(data: List[Any], threshold: int = 0, binary: bool = False) -> int:
     """
     Sorts the data using merge sort algorithm
+    Works on index ranges with a single auxiliary buffer of the same size as data,
+    the two lists trading roles of source and target at every level
     :param data: list of entries to be sorted
-    :param threshold: size of the data at which insertion sort should be called
-    :return : the value of inversion count if threshold > 0
+    :param threshold: insertion sort is called on every range whose halves are shorter than threshold
+    :param binary: call binary_insertion_sort instead of insertion_sort
+    :return : the number of inversions in data
     """
+    if _is_array(data):
+        inversion_count = array_inversions_count(data)
+        data.sort(kind="stable")
+        return inversion_count
     if len(data) < 2:
         return 0
-    mid = len(data) // 2  # Finding the mid of the array
-    left_list = data[:mid]  # Dividing the array elements
-    right_list = data[mid:]  # into 2 halves
+    if len(data) // 2 < threshold:
+        if binary:
+            return _binary_insertion_sort_range(data, 0, len(data))
+        return _insertion_sort_range(data, 0, len(data))
+    buffer = data[:]
+    return _merge_sort_range(buffer, data, 0, len(data), threshold, binary)
+
+
+def _is_array(data: Any) -> bool:
+    """
+    :param data: entries to be sorted
+    :return : True if data is a NumPy ndarray, sorted by the vectorized path, else False
+    """
+    return np is not None and isinstance(data, np.ndarray)
+
+
+def array_inversions_count(data: Any) -> int:
+    """
+    Counts the inversions of a one dimensional NumPy array without modifying it
+    The entries are replaced by dense ranks, then blocks of doubling width are merged bottom-up for
+    the whole array at once: the key block * M + rank, with M the number of distinct ranks, keeps
+    every block apart so that one global searchsorted counts, for every entry of a right block,
+    the greater entries of its left block, and one global sort merges every pair of blocks
+    :param data: one dimensional ndarray of comparable entries
+    :return : the number of inversions in data
+    """
+    n = len(data)
+    if n < 2:
+        return 0
+    distinct, ranks = np.unique(data, return_inverse=True)
+    ranks = ranks.astype(np.int64).ravel()
+    m = len(distinct)
+    positions = np.arange(n, dtype=np.int64)
+    inversion_count = 0
+    width = 1
+    while width < n:
+        pair = positions // (2 * width)
+        in_right = (positions // width) % 2 == 1
+        keys = pair * m + ranks
+        left_keys = keys[~in_right]  # every left block is full and sorted, so left_keys is sorted
+        right_keys = keys[in_right]
+        left_start = pair[in_right] * width
+        not_greater = np.searchsorted(left_keys, right_keys, side="right") - left_start
+        inversion_count += int((width - not_greater).sum())
+        ranks = np.sort(keys) - pair * m
+        width *= 2
+    return inversion_count
+
+
+def natural_merge_sort(data: List[Any], threshold: int = 0) -> int:
+    """
+    Sorts the data bottom-up, starting from the runs already present in it
+    Ascending runs are kept, strictly descending runs are reversed and runs shorter than threshold
+    are extended with binary insertion sort; the runs are then merged pairwise, level by level,
+    through a single auxiliary buffer. Already sorted or reversed data takes O(n).
+    :param data: list of entries to be sorted
+    :param threshold: minimum run length
+    :return : the number of inversions in data
+    """
+    n = len(data)
     inversion_count = 0
+    bounds = [0]  # start of every run, then n
+    while bounds[-1] < n:
+        lo = j = bounds[-1]
+        j += 1
+        if j < n and data[j] < data[lo]:
+            while j < n and data[j] < data[j - 1]:
+                j += 1
+            _reverse_range(data, lo, j)
+            inversion_count += (j - lo) * (j - lo - 1) // 2
+        else:
+            while j < n and not data[j] < data[j - 1]:
+                j += 1
+        if j - lo < threshold:
+            end = min(lo + threshold, n)
+            inversion_count += _binary_insertion_sort_range(data, lo, end, j)
+            j = end
+        bounds.append(j)
+
+    if len(bounds) <= 2:
+        return inversion_count
+    source, target = data, data[:]
+    while len(bounds) > 2:
+        merged = [0]
+        for k in range(0, len(bounds) - 2, 2):
+            lo, mid = bounds[k], bounds[k + 1]
+            hi = bounds[k + 2]
+            inversion_count += _merge_range(source, target, lo, mid, hi)
+            merged.append(hi)
+        if len(bounds) % 2 == 0:  # odd number of runs, the last one moves up unmerged
+            lo = bounds[-2]
+            target[lo:] = source[lo:]
+            merged.append(n)
+        bounds = merged
+        source, target = target, source
+    if source is not data:
+        data[:] = source
+    return inversion_count
+
+
+def _reverse_range(data: List[Any], lo: int, hi: int) -> None:
+    """
+    Reverses data[lo:hi] in place
+    :param data: list holding the range
+    :param lo: start of the range (inclusive)
+    :param hi: end of the range (exclusive)
+    """
+    hi -= 1
+    while lo < hi:
+        data[lo], data[hi] = data[hi], data[lo]
+        lo += 1
+        hi -= 1
 
-    if(len(left_list)) < threshold:
-        insertion_sort(data)
+
+def _merge_sort_range(source: List[Any], target: List[Any], lo: int, hi: int,
+                      threshold: int = 0, binary: bool = False) -> int:
+    """
+    Sorts source[lo:hi] into target[lo:hi]; both hold the same entries in that range on entry
+    and source is used as scratch space
+    :param source: list to read from
+    :param target: list to write the sorted range to
+    :param lo: start of the range (inclusive)
+    :param hi: end of the range (exclusive)
+    :param threshold: insertion sort target[lo:hi] when its halves are shorter than threshold
+    :param binary: call binary insertion sort instead of insertion sort
+    :return : the number of inversions in the range
+    """
+    if hi - lo < 2:
         return 0
-    inversion_count += merge_sort(left_list)  # Sorting the first half
-    inversion_count += merge_sort(right_list)  # Sorting the second half
-    inversion_count += merge(left_list, right_list, data)
+    if (hi - lo) // 2 < threshold:
+        if binary:
+            return _binary_insertion_sort_range(target, lo, hi)
+        return _insertion_sort_range(target, lo, hi)
+    mid = (lo + hi) // 2
+    inversion_count = _merge_sort_range(target, source, lo, mid, threshold, binary)  # Sorting the first half
+    inversion_count += _merge_sort_range(target, source, mid, hi, threshold, binary)  # Sorting the second half
+    inversion_count += _merge_range(source, target, lo, mid, hi)
+    return inversion_count
+
+
+def _merge_range(source: List[Any], target: List[Any], lo: int, mid: int, hi: int) -> int:
+    """
+    Merges the sorted ranges source[lo:mid] and source[mid:hi] into target[lo:hi]
+    :param source: list holding both sorted ranges
+    :param target: list to write the merged range to
+    :param lo: start of the first range (inclusive)
+    :param mid: end of the first range and start of the second
+    :param hi: end of the second range (exclusive)
+    :return : the number of inversions between the ranges
+    """
+    inversion_count = 0
+    i, j, k = lo, mid, lo
+    while i < mid and j < hi:
+        if source[i] <= source[j]:
+            target[k] = source[i]
+            i += 1
+        else:
+            target[k] = source[j]
+            j += 1
+            inversion_count += mid - i
+        k += 1
+    while i < mid:
+        target[k] = source[i]
+        i += 1
+        k += 1
+    while j < hi:
+        target[k] = source[j]
+        j += 1
+        k += 1
     return inversion_count
 
 def merge(left_list, right_list, data):
@@ -75,35 +771,209 @@ def insertion_sort(data: List[Any]) -> None:
     Sorts the data using insertion sort algorithm
     :param: data list of entries to be sorted
     """
-    for i in range(1, len(data)):
+    _insertion_sort_range(data, 0, len(data))
+
+
+def _insertion_sort_range(data: List[Any], lo: int, hi: int) -> int:
+    """
+    Sorts data[lo:hi] in place using insertion sort algorithm
+    :param data: list holding the range
+    :param lo: start of the range (inclusive)
+    :param hi: end of the range (exclusive)
+    :return : the number of shifts, equal to the number of inversions in the range
+    """
+    shifts = 0
+    for i in range(lo + 1, hi):
         entry = data[i]
         j = i
-        while (j > 0 and entry < data[j-1]):
-            data[j] = data[j-1]
+        while j > lo and entry < data[j - 1]:
+            data[j] = data[j - 1]
             j -= 1
         data[j] = entry
+        shifts += i - j
+    return shifts
+
+
+def binary_insertion_sort(data: List[Any], lo: int = 0, hi: int = None) -> None:
+    """
+    Sorts data[lo:hi] in place using binary insertion sort algorithm: bisect finds the position
+    of every entry and the entries after it move as one block, so only O(n log n) comparisons
+    are made; no sub-list of the range is created
+    :param data: list of entries to be sorted
+    :param lo: start of the range to sort (inclusive)
+    :param hi: end of the range to sort (exclusive), len(data) when not given
+    """
+    _binary_insertion_sort_range(data, lo, len(data) if hi is None else hi)
+
+
+def _binary_insertion_sort_range(data: List[Any], lo: int, hi: int, start: int = None) -> int:
+    """
+    Sorts data[lo:hi] in place by binary searching the position of every entry
+    and shifting the entries after it as one block
+    :param data: list holding the range
+    :param lo: start of the range (inclusive)
+    :param hi: end of the range (exclusive)
+    :param start: data[lo:start] is already sorted, lo + 1 when not given
+    :return : the number of shifts, equal to the number of inversions in the range
+    """
+    shifts = 0
+    for i in range(max(start or lo + 1, lo + 1), hi):
+        entry = data[i]
+        position = bisect_right(data, entry, lo, i)
+        if position < i:
+            data[position + 1:i + 1] = data[position:i]
+            data[position] = entry
+            shifts += i - position
+    return shifts
 
 def find_match(user_interests: List[str], candidate_interests: Dict[str, List]) -> str:
     """
     Returns the name of the best matching candidate for the user in terms of their interests
     by checking which candidate's interests are closest to being in the same order as the
-    user
+    user; the first of equally close candidates wins
     :param user_interests: list of interests of the user
     :param candidate_interests: dictionary of the names of the candidates
     as the key and a list of their interests stored as the value to the key
-    :return : the name of the best match
-    """
-    user_dict = {user_interests[i]: i for i in range(0, len(user_interests))}
-    for key in candidate_interests:
-        new_list = []
-        for i in candidate_interests[key]:
-            new_list.append(user_dict[i])
-        candidate_interests[key] = new_list
-
-    min = 99999999
-    for key in candidate_interests:
-        inversions = inversions_count(candidate_interests[key])
-        if inversions < min:
-            min = inversions
-            name = key
-    return name
+    :return : the name of the best match, None when there are no candidates
+    """
+    return MatchIndex(candidate_interests).best(user_interests)
+
+
+class MatchIndex:
+    """
+    Candidates indexed once for answering many match queries
+    Every candidate's interests are stored as interest ids; a query maps them to the user's ranks and
+    ranks candidates by Kendall tau distance, the inversions of that sequence. Candidates are scanned
+    in insertion order and a candidate's count stops as soon as it can no longer beat the current
+    k-th best, so equally close candidates keep their insertion order.
+    """
+
+    def __init__(self, candidate_interests: Dict[str, List[str]] = None) -> None:
+        """
+        :param candidate_interests: dictionary of the names of the candidates
+        as the key and a list of their interests stored as the value to the key
+        """
+        self._ids = {}  # interest -> id
+        self._names = []
+        self._candidates = []  # tuple of interest ids per candidate
+        for name, interests in (candidate_interests or {}).items():
+            self.add(name, interests)
+
+    def __len__(self) -> int:
+        """
+        :return : number of candidates
+        """
+        return len(self._names)
+
+    def add(self, name: str, interests: List[str]) -> None:
+        """
+        Indexes one more candidate, after the existing ones
+        :param name: name of the candidate
+        :param interests: interests of the candidate, most important first
+        """
+        self._names.append(name)
+        self._candidates.append(tuple(self._ids.setdefault(interest, len(self._ids))
+                                      for interest in interests))
+
+    def top_k(self, user_interests: List[str], k: int = 1) -> List[Tuple[str, int]]:
+        """
+        :param user_interests: interests of the user, most important first
+        :param k: number of matches to return
+        :raises KeyError: if a candidate has an interest the user does not list
+        :return : up to k (name, distance) pairs, closest first
+        """
+        ranks = self._ranks(user_interests)
+        return [(self._names[order], distance)
+                for distance, order in _top_k(self._candidates, range(len(self._candidates)), ranks, k)]
+
+    def best(self, user_interests: List[str]) -> str:
+        """
+        :param user_interests: interests of the user, most important first
+        :raises KeyError: if a candidate has an interest the user does not list
+        :return : name of the closest candidate, None when there are no candidates
+        """
+        matches = self.top_k(user_interests, 1)
+        return matches[0][0] if matches else None
+
+    def batch(self, users: Iterable[List[str]], k: int = 1, workers: int = None) -> List[List[Tuple[str, int]]]:
+        """
+        Answers top_k for many users, splitting the candidates across worker processes
+        :param users: interests of every user
+        :param k: number of matches per user
+        :param workers: number of worker processes; when not given, os.cpu_count() for indexes of
+        at least PARALLEL_CANDIDATES candidates and no process pool for smaller ones
+        :raises KeyError: if a candidate has an interest a user does not list
+        :return : the top_k result of every user, in the order of users
+        """
+        rank_maps = [self._ranks(interests) for interests in users]
+        count = len(self._candidates)
+        if workers is None:
+            workers = (os.cpu_count() or 1) if count >= PARALLEL_CANDIDATES else 1
+        if workers < 2 or count < 2:
+            results = _top_k_batch(self._candidates, range(count), rank_maps, k)
+        else:
+            size = -(-count // workers)  # ceiling division
+            starts = range(0, count, size)
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                parts = list(executor.map(_top_k_batch, [self._candidates[i:i + size] for i in starts],
+                                          [range(i, min(i + size, count)) for i in starts],
+                                          repeat(rank_maps), repeat(k)))
+            results = [sorted(match for part in parts for match in part[user])[:k]
+                       for user in range(len(rank_maps))]
+        return [[(self._names[order], distance) for distance, order in result] for result in results]
+
+    def _ranks(self, user_interests: List[str]) -> Dict[int, int]:
+        """
+        :param user_interests: interests of the user, most important first
+        :return : rank of every indexed interest the user lists, by interest id; the last one of repeats
+        """
+        ranks = {}
+        for rank, interest in enumerate(user_interests):
+            if interest in self._ids:
+                ranks[self._ids[interest]] = rank
+        return ranks
+
+
+def _top_k(candidates: List[tuple], orders: Iterable[int], ranks: Dict[int, int], k: int) -> List[Tuple[int, int]]:
+    """
+    Counts the inversions of every candidate under ranks with a Fenwick tree, abandoning a candidate
+    once its partial count reaches the distance of the current k-th best
+    :param candidates: interest ids of every candidate
+    :param orders: insertion order of every candidate, breaking ties
+    :param ranks: rank of every interest id
+    :param k: number of matches to keep
+    :return : up to k (distance, order) pairs, closest first
+    """
+    if k <= 0:
+        return []
+    kept = []  # (-distance, -order), the worst kept match on top
+    size = max(ranks.values(), default=-1) + 2
+    for order, ids in zip(orders, candidates):
+        bound = -kept[0][0] if len(kept) == k else None
+        tree = [0] * size
+        inversion_count = 0
+        for seen, interest in enumerate(ids):
+            rank = ranks[interest] + 1
+            inversion_count += seen - _fenwick_prefix(tree, rank)
+            if bound is not None and inversion_count >= bound:
+                break
+            _fenwick_add(tree, rank, 1)
+        else:
+            if bound is None:
+                heappush(kept, (-inversion_count, -order))
+            else:
+                heapreplace(kept, (-inversion_count, -order))
+    return sorted((-distance, -order) for distance, order in kept)
+
+
+def _top_k_batch(candidates: List[tuple], orders: range, rank_maps: List[Dict[int, int]],
+                 k: int) -> List[List[Tuple[int, int]]]:
+    """
+    Worker task of MatchIndex.batch
+    :param candidates: interest ids of a slice of the candidates
+    :param orders: insertion order of every candidate of the slice
+    :param rank_maps: ranks of every user
+    :param k: number of matches per user
+    :return : the (distance, order) matches of every user among the slice
+    """
+    return [_top_k(candidates, orders, ranks, k) for ranks in rank_maps]
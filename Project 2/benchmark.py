@@ -0,0 +1,352 @@
+"""
+Project 2 - Hybrid Sorting - Benchmarks
+Times the hybrid sort variants and writes one JSON report
+Run from this directory with: python benchmark.py --suite parallel --output results.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tracemalloc
+from heapq import merge as heap_merge
+from random import random, randrange, sample, seed
+from time import perf_counter
+from typing import Dict, List
+
+from HybridSort import hybrid_sort, parallel_hybrid_sort, merge_sort, merge, natural_merge_sort, \
+    insertion_sort, binary_insertion_sort, tune_threshold, TUNING_CANDIDATES, inversions_count, np, \
+    external_sort, merge_iter, InversionCounter, MatchIndex, find_match
+
+THRESHOLD = 16
+
+
+def _random_data(size: int) -> List[float]:
+    """
+    :param size: number of entries
+    :return: reproducible list of random floats
+    """
+    seed(size)
+    return [random() for _ in range(size)]
+
+
+def slicing_merge_sort(data: List, threshold: int = 0) -> int:
+    """
+    Original merge_sort kept as a baseline: slices both halves at every level
+    :param data: list of entries to be sorted
+    :param threshold: unused below the top level, as in the original
+    :return: the number of inversions
+    """
+    if len(data) < 2:
+        return 0
+    mid = len(data) // 2
+    left_list, right_list = data[:mid], data[mid:]
+    inversion_count = slicing_merge_sort(left_list)
+    inversion_count += slicing_merge_sort(right_list)
+    inversion_count += merge(left_list, right_list, data)
+    return inversion_count
+
+
+def allocation(sizes: List[int] = None) -> List[Dict]:
+    """
+    Compares peak traced memory and time of the slicing baseline with the single buffer merge_sort
+    :param sizes: list lengths, 1e5 and 1e6 when not given
+    :return: one record per size and implementation
+    """
+    records = []
+    for size in sizes or [100_000, 1_000_000]:
+        data = _random_data(size)
+        for name, sort in (("slicing", slicing_merge_sort), ("single_buffer", merge_sort)):
+            copy = data[:]
+            tracemalloc.start()
+            start = perf_counter()
+            sort(copy)
+            seconds = perf_counter() - start
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            records.append({"size": size, "implementation": name, "seconds": seconds,
+                            "peak_bytes": peak, "peak_bytes_per_entry": peak / size})
+        del data
+    return records
+
+
+def _nearly_sorted(size: int, swaps: int) -> List[int]:
+    """
+    :param size: number of entries
+    :param swaps: number of random pairs swapped in the sorted sequence
+    :return: reproducible nearly sorted list, like an appended time series with late arrivals
+    """
+    seed(size + swaps)
+    data = list(range(size))
+    for _ in range(swaps):
+        i, j = randrange(size), randrange(size)
+        data[i], data[j] = data[j], data[i]
+    return data
+
+
+def small_runs(sizes: List[int] = None, repeat: int = 1000) -> List[Dict]:
+    """
+    Times insertion_sort against binary_insertion_sort on the short lists the hybrid hands them
+    :param sizes: list lengths, 8 to 256 when not given
+    :param repeat: number of sorts timed per size
+    :return: one record per size and implementation, in seconds per sort
+    """
+    records = []
+    for size in sizes or [8, 16, 32, 64, 128, 256]:
+        data = _random_data(size)
+        for name, sort in (("linear", insertion_sort), ("binary", binary_insertion_sort)):
+            start = perf_counter()
+            for _ in range(repeat):
+                sort(data[:])
+            records.append({"size": size, "implementation": name,
+                            "seconds": (perf_counter() - start) / repeat})
+    return records
+
+
+def threshold_sweep(sizes: List[int] = None) -> List[Dict]:
+    """
+    Times merge_sort with every tuning candidate and with the threshold tune_threshold picks
+    :param sizes: list lengths, 1e5 when not given
+    :return: one record per size and threshold, the tuned one marked
+    """
+    records = []
+    for size in sizes or [100_000]:
+        data = _random_data(size)
+        start = perf_counter()
+        tuned = tune_threshold(data[:4096])
+        tuning = perf_counter() - start
+        for threshold in TUNING_CANDIDATES:
+            copy = data[:]
+            start = perf_counter()
+            merge_sort(copy, threshold)
+            records.append({"size": size, "threshold": threshold, "tuned": threshold == tuned,
+                            "seconds": perf_counter() - start, "tuning_seconds": tuning})
+    return records
+
+
+def numpy_arrays(sizes: List[int] = None) -> List[Dict]:
+    """
+    Times hybrid_sort and inversions_count on a list against the same values as an int64 ndarray
+    :param sizes: lengths, 1e5 and 1e6 when not given
+    :return: one record per size and input kind, or a note when NumPy is not installed
+    """
+    if np is None:
+        return [{"skipped": "numpy is not installed"}]
+    records = []
+    for size in sizes or [100_000, 1_000_000]:
+        seed(size)
+        values = [randrange(size) for _ in range(size)]
+        for kind, make in (("list", list), ("ndarray", lambda items: np.array(items, dtype=np.int64))):
+            data = make(values)
+            start = perf_counter()
+            inversions_count(make(values))
+            counting = perf_counter() - start
+            start = perf_counter()
+            hybrid_sort(data, THRESHOLD)
+            records.append({"size": size, "input": kind, "sort_seconds": perf_counter() - start,
+                            "inversions_seconds": counting})
+    return records
+
+
+def external(sizes: List[int] = None, budgets: List[int] = None, fan_in: int = 16) -> List[Dict]:
+    """
+    Times external_sort of random text lines and records the peak traced memory for every budget
+    :param sizes: numbers of lines, 1e6 when not given
+    :param budgets: memory budgets in bytes, 1 MiB to 64 MiB when not given
+    :param fan_in: runs merged at once
+    :return: one record per size and budget
+    """
+    records = []
+    for size in sizes or [1_000_000]:
+        lines = ["{:.12f}\n".format(value) for value in _random_data(size)]
+        for budget in budgets or [2 ** 20, 2 ** 23, 2 ** 26]:
+            tracemalloc.start()
+            start = perf_counter()
+            for _ in external_sort(iter(lines), memory_budget=budget, fan_in=fan_in, threshold=THRESHOLD):
+                pass
+            seconds = perf_counter() - start
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            records.append({"size": size, "memory_budget": budget, "seconds": seconds,
+                            "peak_bytes": peak})
+    return records
+
+
+def k_way_merge(size: int = 1_000_000, runs: List[int] = None) -> List[Dict]:
+    """
+    Times merge_iter against heapq.merge and sorting the concatenation, for k sorted runs
+    :param size: total number of entries
+    :param runs: numbers of runs, 2 to 256 when not given
+    :return: one record per number of runs and implementation
+    """
+    records = []
+    data = _random_data(size)
+    for k in runs or [2, 16, 256]:
+        parts = [sorted(data[i::k]) for i in range(k)]
+        for name, merge_all in (("merge_iter", lambda: list(merge_iter(*parts))),
+                                ("heapq.merge", lambda: list(heap_merge(*parts))),
+                                ("sorted", lambda: sorted(value for part in parts for value in part))):
+            start = perf_counter()
+            merge_all()
+            records.append({"size": size, "runs": k, "implementation": name,
+                            "seconds": perf_counter() - start})
+    return records
+
+
+def inversion_counting(sizes: List[int] = None) -> List[Dict]:
+    """
+    Times counting inversions with merge_sort on a copy against the Fenwick tree inversions_count,
+    and the cost of one InversionCounter append
+    :param sizes: lengths, 1e4 to 1e6 when not given
+    :return: one record per size
+    """
+    records = []
+    for size in sizes or [10_000, 100_000, 1_000_000]:
+        seed(size)
+        data = [randrange(size) for _ in range(size)]
+        start = perf_counter()
+        merge_sort(data[:])
+        merging = perf_counter() - start
+        start = perf_counter()
+        inversions_count(data)
+        fenwick = perf_counter() - start
+        counter = InversionCounter(data, universe=range(size))
+        start = perf_counter()
+        for value in data[:1000]:
+            counter.append(value)
+        records.append({"size": size, "merge_sort_seconds": merging, "fenwick_seconds": fenwick,
+                        "append_seconds": (perf_counter() - start) / 1000})
+    return records
+
+
+def matching(candidates: int = 10_000, users: int = 20, interests: int = 20, k: int = 10) -> Dict:
+    """
+    Times find_match per user against one MatchIndex answering a batch, sequentially and in parallel
+    :param candidates: number of candidates
+    :param users: number of users
+    :param interests: interests per candidate and user
+    :param k: matches per user in the batch
+    :return: seconds of every approach
+    """
+    seed(candidates)
+    names = ["interest {}".format(i) for i in range(interests)]
+    pool = {"candidate {}".format(i): sample(names, interests) for i in range(candidates)}
+    queries = [sample(names, interests) for _ in range(users)]
+
+    start = perf_counter()
+    for query in queries:
+        find_match(query, pool)
+    results = {"find_match": perf_counter() - start}
+
+    start = perf_counter()
+    index = MatchIndex(pool)
+    results["index_build"] = perf_counter() - start
+    for workers in (1, None):
+        start = perf_counter()
+        index.batch(queries, k, workers)
+        results["batch_workers_{}".format(workers or "auto")] = perf_counter() - start
+    return results
+
+
+def natural_runs(sizes: List[int] = None, threshold: int = THRESHOLD) -> List[Dict]:
+    """
+    Times the top-down merge_sort against the bottom-up natural_merge_sort
+    on sorted, nearly sorted, reversed and random data
+    :param sizes: list lengths, 1e5 and 1e6 when not given
+    :param threshold: threshold passed to both sorts
+    :return: one record per size, input shape and implementation
+    """
+    records = []
+    for size in sizes or [100_000, 1_000_000]:
+        shapes = {
+            "sorted": list(range(size)),
+            "nearly_sorted": _nearly_sorted(size, size // 1000),
+            "reversed": list(range(size, 0, -1)),
+            "random": _random_data(size),
+        }
+        for shape, data in shapes.items():
+            for name, sort in (("top_down", merge_sort), ("natural", natural_merge_sort)):
+                copy = data[:]
+                start = perf_counter()
+                sort(copy, threshold)
+                records.append({"size": size, "input": shape, "implementation": name,
+                                "seconds": perf_counter() - start})
+    return records
+
+
+def parallel_scaling(sizes: List[int] = None, workers: List[int] = None,
+                     threshold: int = THRESHOLD) -> List[Dict]:
+    """
+    Times parallel_hybrid_sort for every worker count against the sequential hybrid_sort
+    :param sizes: list lengths, 1e6 and 1e7 when not given
+    :param workers: worker counts, powers of two up to os.cpu_count() when not given
+    :param threshold: threshold passed to both sorts
+    :return: one record per size and worker count
+    """
+    cores = os.cpu_count() or 1
+    workers = workers or [2 ** i for i in range(cores.bit_length()) if 2 ** i <= cores]
+    records = []
+    for size in sizes or [1_000_000, 10_000_000]:
+        data = _random_data(size)
+        start = perf_counter()
+        hybrid_sort(data[:], threshold)
+        sequential = perf_counter() - start
+        for count in workers:
+            copy = data[:]
+            start = perf_counter()
+            parallel_hybrid_sort(copy, threshold, workers=count)
+            seconds = perf_counter() - start
+            records.append({"size": size, "workers": count, "seconds": seconds,
+                            "speedup": sequential / seconds})
+        del data
+    return records
+
+
+SUITES = {
+    "allocation": lambda args: allocation(args.sizes),
+    "natural": lambda args: natural_runs(args.sizes, args.threshold),
+    "insertion": lambda args: small_runs(args.sizes),
+    "threshold": lambda args: threshold_sweep(args.sizes),
+    "numpy": lambda args: numpy_arrays(args.sizes),
+    "external": lambda args: external(args.sizes),
+    "merge": lambda args: k_way_merge(*(args.sizes or [])[:1]),
+    "inversions": lambda args: inversion_counting(args.sizes),
+    "matching": lambda args: matching(*(args.sizes or [])[:1]),
+    "parallel": lambda args: parallel_scaling(args.sizes, args.workers, args.threshold),
+}
+
+
+def main(argv: List[str] = None) -> Dict:
+    """
+    Runs the selected suites and writes one JSON report
+    :param argv: command line arguments, sys.argv when not given
+    :return: the report
+    """
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--suite", nargs="+", choices=sorted(SUITES), default=["parallel"])
+    parser.add_argument("--sizes", nargs="+", type=int, default=None,
+                        help="list lengths, each suite has its own default")
+    parser.add_argument("--workers", nargs="+", type=int, default=None)
+    parser.add_argument("--threshold", type=int, default=THRESHOLD)
+    parser.add_argument("--output", default="-", help="file for the JSON report, - for stdout")
+    args = parser.parse_args(argv)
+
+    report = {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "results": {suite: SUITES[suite](args) for suite in args.suite},
+    }
+    if args.output == "-":
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    else:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+    return report
+
+
+if __name__ == '__main__':
+    main()
@@ -5,8 +5,14 @@ CSE 331 Fall 2020
 Professor Sebnem Onsay
 """
 
+import json
+import os
+import tempfile
 import unittest
-from HybridSort import insertion_sort, merge_sort, hybrid_sort, inversions_count, find_match
+from HybridSort import insertion_sort, merge_sort, hybrid_sort, inversions_count, find_match, \
+    parallel_hybrid_sort, natural_merge_sort, binary_insertion_sort, tuned_threshold, \
+    PROFILE_ENV, TUNING_CANDIDATES, array_inversions_count, np, external_sort, merge_iter, merge_join, \
+    inversion_profile, InversionCounter, MatchIndex, TUNING_MINIMUM, DEFAULT_THRESHOLD
 from random import seed, sample, randint
 
 """
@@ -17,6 +23,22 @@ seed(345)  # change the seed to generate a new set of random numbers.
 random_data = sample(range(0, 10000), 30)  # creates a list of 30 random ints in the range [0, 10000).
 
 
+class Entry:
+    """Entry compared by key only, used to check stability"""
+
+    def __init__(self, key, tag):
+        self.key, self.tag = key, tag
+
+    def __lt__(self, other):
+        return self.key < other.key
+
+    def __le__(self, other):
+        return self.key <= other.key
+
+    def __eq__(self, other):
+        return self.key == other.key
+
+
 class Project2Tests(unittest.TestCase):
 
     def test_insertion_sort(self):
@@ -190,6 +212,45 @@ class Project2Tests(unittest.TestCase):
         assert (reverse_inversions == 55)
 
 
+    def test_inversion_profile(self):
+        # inversions_count and inversion_profile leave data unchanged.
+        data = [2, 4, 1, 3, 5]
+        assert inversions_count(data) == 3 and data == [2, 4, 1, 3, 5]
+        assert inversion_profile(data) == [0, 0, 2, 1, 0]
+        assert inversion_profile([]) == [] and inversion_profile(["b", "a", "a"]) == [0, 1, 1]
+
+        # Appends and changes keep the count and profile current.
+        counter = InversionCounter([3, 1], universe=range(5))
+        assert counter.inversions() == 1 and counter.profile() == [0, 1]
+        assert counter.append(2) == 1 and counter.append(0) == 3
+        assert counter.append(7) == 0  # outside the universe
+        assert counter.inversions() == 5 and counter.profile() == [0, 1, 1, 3, 0] and len(counter) == 5
+
+        counter.change(0, 1)  # [1, 1, 2, 0, 7]
+        assert counter.profile() == [0, 0, 0, 3, 0] and counter.inversions() == 3
+        counter.change(-1, -1)  # [1, 1, 2, 0, -1]
+        assert counter.profile() == [0, 0, 0, 3, 4] and counter.inversions() == 7
+
+        seed(24)
+        data = [randint(0, 30) for _ in range(200)]
+        counter = InversionCounter()
+        for entry in data:
+            counter.append(entry)
+        assert counter.inversions() == inversions_count(data) == merge_sort(data[:])
+
+        # Values outside the universe are batched into a logarithmic number of rebuilds.
+        counter, rebuilds = InversionCounter(), []
+        rebuild = counter._rebuild
+        counter._rebuild = lambda values: rebuilds.append(len(values)) or rebuild(values)
+        data = sample(range(4000), 4000) + [7, 7]
+        for entry in data:
+            counter.append(entry)
+        counter.change(5, -1)
+        counter.change(-3, 5000)
+        data[5], data[-3] = -1, 5000
+        assert counter.profile() == inversion_profile(data) and counter.inversions() == inversions_count(data)
+        assert len(rebuilds) <= 13
+
     def test_find_match(self):
         winnie_the_pooh_interests_ = ['Hunny', 'Playing Poohsticks', 'Adventures', 'Poems', 'Mornings']
         candidate_interests = {
@@ -199,8 +260,10 @@ class Project2Tests(unittest.TestCase):
             'Rabbit': ['Playing Poohsticks', 'Hunny', 'Adventures', 'Poems', 'Mornings']
         }
 
+        original = {name: interests[:] for name, interests in candidate_interests.items()}
         best_match = find_match(winnie_the_pooh_interests_, candidate_interests)
         assert (best_match == 'Rabbit')
+        assert candidate_interests == original
 
         prince_charming_interests = ['one glass slipper', 'hide and seek', 'gardens', 'magic',
                                      'horseback riding', 'ruling a kingdom', 'clocks']
@@ -236,6 +299,289 @@ class Project2Tests(unittest.TestCase):
         best_match = find_match(snow_white_interests, candidate_interests)
         assert (best_match == "The Prince")
 
+    def test_binary_insertion_sort(self):
+        # Test with basic set of integers and strings.
+        data = [7, 4, 1, 0, 8, 9, 3, 2, 12]
+        result = binary_insertion_sort(data)
+
+        assert result is None and data == sorted(data)
+
+        data = ["dog", "banana", "orange", "tree", "clutter", "candy", "silence"]
+        binary_insertion_sort(data)
+
+        assert data == sorted(data)
+
+        # Test sorting only a range.
+        data = [9, 8, 7, 6, 5, 4, 3, 2, 1]
+        binary_insertion_sort(data, 2, 6)
+
+        assert data == [9, 8, 4, 5, 6, 7, 3, 2, 1]
+
+        # Test stability and the hybrid_sort option.
+        data = [Entry(randint(0, 3), i) for i in range(50)]
+        expected = [(entry.key, entry.tag) for entry in sorted(data, key=lambda entry: entry.key)]
+        hybrid_sort(data, 100, binary=True)
+
+        assert [(entry.key, entry.tag) for entry in data] == expected
+
+        data = [5, 4, 3, 2, 1]
+        assert merge_sort(data, 10, binary=True) == 10 and data == [1, 2, 3, 4, 5]
+
+    def test_merge_sort_inversions(self):
+        # Inversions are counted on both the merge and the insertion path.
+        seed(17)
+        for threshold in (0, 4, 100):
+            data = [randint(0, 50) for _ in range(40)]
+            expected = sum(data[i] > data[j] for i in range(40) for j in range(i + 1, 40))
+            inversions = merge_sort(data, threshold)
+
+            assert inversions == expected and data == sorted(data)
+
+    def test_natural_merge_sort(self):
+        # Test with sorted, reversed and nearly sorted data.
+        data = [1, 2, 3, 4, 5, 6, 7, 8, 9]
+        assert natural_merge_sort(data, 4) == 0 and data == [1, 2, 3, 4, 5, 6, 7, 8, 9]
+
+        data = [9, 8, 7, 6, 5, 4, 3, 2, 1]
+        assert natural_merge_sort(data, 4) == 36 and data == [1, 2, 3, 4, 5, 6, 7, 8, 9]
+
+        data = [1, 2, 3, 9, 4, 5, 6, 7, 8, 0]
+        assert natural_merge_sort(data) == 14 and data == [0, 1, 2, 3, 4, 5, 6, 7, 8, 9]
+
+        # Random data matches merge_sort, with every threshold.
+        seed(18)
+        for threshold in (0, 2, 5, 50):
+            data = [randint(0, 20) for _ in range(60)]
+            expected = data[:]
+            inversions = merge_sort(expected)
+
+            assert natural_merge_sort(data, threshold) == inversions and data == expected
+
+        # Test stability and the hybrid_sort option.
+        data = [Entry(randint(0, 5), i) for i in range(100)]
+        expected = [(entry.key, entry.tag) for entry in sorted(data, key=lambda entry: entry.key)]
+        result = hybrid_sort(data, 6, natural=True)
+
+        assert result is None and [(entry.key, entry.tag) for entry in data] == expected
+
+    def test_tuned_threshold(self):
+        seed(20)
+        data = [randint(0, 1000) for _ in range(500)]
+        previous = os.environ.get(PROFILE_ENV)
+        try:
+            with tempfile.TemporaryDirectory() as directory:
+                # Tuning stores the threshold in the profile.
+                path = os.path.join(directory, "profile.json")
+                os.environ[PROFILE_ENV] = path
+                threshold = tuned_threshold(data)
+                with open(path) as file:
+                    profile = json.load(file)
+
+                assert threshold in TUNING_CANDIDATES and list(profile.values()) == [threshold]
+
+                # A stored threshold is used without tuning.
+                path = os.path.join(directory, "other.json")
+                with open(path, "w") as file:
+                    json.dump({key: 7 for key in profile}, file)
+                os.environ[PROFILE_ENV] = path
+
+                assert tuned_threshold(data) == 7
+
+                # Every type of entry is tuned separately.
+                tuned_threshold([1.5, 0.5] * TUNING_MINIMUM)
+                with open(path) as file:
+                    assert len(json.load(file)) == 2
+
+                # Too few entries to time are sorted with the default and not stored.
+                assert tuned_threshold(["b", "a"]) == DEFAULT_THRESHOLD
+                hybrid_sort([3, 1])
+                with open(path) as file:
+                    assert len(json.load(file)) == 2
+                path = os.path.join(directory, "empty.json")
+                os.environ[PROFILE_ENV] = path
+                hybrid_sort([3, 1])
+                assert not os.path.exists(path)
+
+                result = data[:]
+                hybrid_sort(result)
+
+                assert result == sorted(data)
+        finally:
+            if previous is None:
+                del os.environ[PROFILE_ENV]
+            else:
+                os.environ[PROFILE_ENV] = previous
+
+    @unittest.skipUnless(np is not None, "numpy is not installed")
+    def test_numpy_arrays(self):
+        # Arrays are sorted in place with the same result as lists.
+        seed(21)
+        for dtype in (np.int64, np.float64):
+            values = [randint(-50, 50) for _ in range(300)]
+            data = np.array(values, dtype=dtype)
+            hybrid_sort(data, 8)
+
+            assert isinstance(data, np.ndarray) and data.tolist() == sorted(values)
+
+        # Arrays are never tuned on, so the profile is left alone.
+        previous = os.environ.get(PROFILE_ENV)
+        try:
+            with tempfile.TemporaryDirectory() as directory:
+                path = os.path.join(directory, "profile.json")
+                os.environ[PROFILE_ENV] = path
+                values = [randint(-50, 50) for _ in range(1000)]
+                data = np.array(values)
+                parallel_hybrid_sort(data, workers=2)
+
+                assert data.tolist() == sorted(values) and not os.path.exists(path)
+        finally:
+            if previous is None:
+                del os.environ[PROFILE_ENV]
+            else:
+                os.environ[PROFILE_ENV] = previous
+
+        # Inversions match the list path and leave the array untouched.
+        for size in (0, 1, 2, 7, 64, 257):
+            values = [randint(0, 20) for _ in range(size)]
+            data = np.array(values)
+
+            assert array_inversions_count(data) == inversions_count(values[:])
+            assert data.tolist() == values
+
+        data = np.array([2, 4, 1, 3, 5])
+        assert inversions_count(data) == 3 and data.tolist() == [2, 4, 1, 3, 5]
+
+    def test_merge_iter(self):
+        # Test with several sorted iterables, including empty ones and generators.
+        result = list(merge_iter([1, 4, 7], iter([2, 5, 8]), [], (x for x in [0, 3, 9])))
+
+        assert result == [0, 1, 2, 3, 4, 5, 7, 8, 9]
+        assert list(merge_iter()) == [] and list(merge_iter([2, 1])) == [2, 1]
+
+        # Test stability with entries compared only by key.
+        first = [Entry(1, "a"), Entry(2, "a"), Entry(2, "b")]
+        second = [Entry(1, "c"), Entry(2, "c")]
+        result = [(entry.key, entry.tag) for entry in merge_iter(first, second, key=lambda entry: entry.key)]
+
+        assert result == [(1, "a"), (1, "c"), (2, "a"), (2, "b"), (2, "c")]
+
+    def test_merge_join(self):
+        users = [(1, "ann"), (2, "bob"), (2, "bea"), (4, "dan")]
+        orders = [(1, "tea"), (1, "jam"), (2, "pen"), (3, "ink")]
+
+        # Test inner join with duplicate keys on both sides.
+        result = list(merge_join(users, orders, key=lambda row: row[0]))
+
+        assert result == [((1, "ann"), (1, "tea")), ((1, "ann"), (1, "jam")),
+                          ((2, "bob"), (2, "pen")), ((2, "bea"), (2, "pen"))]
+
+        # Test left join and a right stream that is consumed lazily.
+        result = list(merge_join(iter(users), iter(orders), key=lambda row: row[0], how="left"))
+
+        assert result[-1] == ((4, "dan"), None) and len(result) == 5
+
+        result = list(merge_join([1, 2, 3], [(2, "x")], right_key=lambda row: row[0]))
+
+        assert result == [(2, (2, "x"))]
+
+        with self.assertRaises(ValueError):
+            list(merge_join(users, orders, how="outer"))
+
+    def test_external_sort(self):
+        # Test with many runs merged in several passes.
+        seed(22)
+        data = [randint(0, 1000) for _ in range(3000)]
+        result = list(external_sort(iter(data), memory_budget=2000, fan_in=3, threshold=8))
+
+        assert result == sorted(data)
+
+        # Test stability with a key function, reading lines from a file.
+        with tempfile.TemporaryFile("w+") as file:
+            lines = ["{} {}\n".format(randint(0, 9), i) for i in range(2000)]
+            file.writelines(lines)
+            file.seek(0)
+            result = list(external_sort(file, key=lambda line: int(line.split()[0]),
+                                        memory_budget=10000, fan_in=2, threshold=8, temp_dir=None))
+
+        assert result == sorted(lines, key=lambda line: int(line.split()[0]))
+
+        # Test with data fitting in memory and with no data.
+        assert list(external_sort(["b", "c", "a"], threshold=4)) == ["a", "b", "c"]
+        assert list(external_sort([], threshold=4)) == []
+
+        # Without a threshold the keys are tuned on, not the records.
+        previous = os.environ.get(PROFILE_ENV)
+        try:
+            with tempfile.TemporaryDirectory() as directory:
+                path = os.path.join(directory, "profile.json")
+                os.environ[PROFILE_ENV] = path
+                result = list(external_sort(iter(data), memory_budget=100000))
+                with open(path) as file:
+                    profile = json.load(file)
+
+                assert result == sorted(data) and [key.split("|")[0] for key in profile] == ["builtins.int"]
+        finally:
+            if previous is None:
+                del os.environ[PROFILE_ENV]
+            else:
+                os.environ[PROFILE_ENV] = previous
+
+    def test_parallel_hybrid_sort(self):
+        # Test with several workers.
+        seed(16)
+        data = [randint(0, 1000) for _ in range(1000)]
+        expected = sorted(data)
+        result = data
+        parallel_hybrid_sort(result, 8, workers=3)
+
+        assert result == expected
+
+        # Test stability across runs.
+        data = [Entry(randint(0, 5), i) for i in range(200)]
+        expected = [(entry.key, entry.tag) for entry in sorted(data, key=lambda entry: entry.key)]
+        parallel_hybrid_sort(data, 4, workers=4)
+
+        assert [(entry.key, entry.tag) for entry in data] == expected
+
+        # Test with too little data to split and a single worker.
+        for workers in (4, 1):
+            data = [3, 1, 2]
+            result = parallel_hybrid_sort(data, 2, workers=workers)
+
+            assert result is None and data == [1, 2, 3]
+
+    def test_match_index(self):
+        interests = ['Hunny', 'Playing Poohsticks', 'Adventures', 'Poems', 'Mornings']
+        index = MatchIndex({
+            "Eeyore": ['Mornings', 'Poems', 'Adventures', 'Playing Poohsticks', 'Hunny'],
+            "Piglet": ['Poems', 'Playing Poohsticks', 'Mornings', 'Adventures', 'Hunny'],
+            'Tigger': ['Adventures', 'Mornings', 'Hunny', 'Poems', 'Playing Poohsticks'],
+            'Rabbit': ['Playing Poohsticks', 'Hunny', 'Adventures', 'Poems', 'Mornings']
+        })
+
+        # Matches are ordered by distance, ties by insertion order.
+        assert len(index) == 4 and index.best(interests) == 'Rabbit'
+        assert index.top_k(interests, 3) == [('Rabbit', 1), ('Tigger', 6), ('Piglet', 7)]
+        assert index.top_k(interests[::-1], 4) == [('Eeyore', 0), ('Piglet', 3), ('Tigger', 4), ('Rabbit', 9)]
+        assert index.top_k(interests, 0) == [] and MatchIndex().best(interests) is None
+
+        index.add('Roo', interests)
+        assert index.best(interests) == 'Roo'
+        index.add('Kanga', interests)
+        assert index.top_k(interests, 2) == [('Roo', 0), ('Kanga', 0)]
+
+        # Batches give the same results with and without worker processes.
+        seed(25)
+        index = MatchIndex({str(i): sample(interests, 5) for i in range(200)})
+        users = [sample(interests, 5) for _ in range(4)]
+        expected = [index.top_k(user, 5) for user in users]
+
+        assert index.batch(users, 5) == expected
+        assert index.batch(users, 5, workers=3) == expected
+
+        with self.assertRaises(KeyError):
+            index.best(interests[1:])
+
 
 if __name__ == '__main__':
     unittest.main()